@@ -0,0 +1,33 @@
+"""
+Evaluation of a long chain of dependent closures, e.g., iterative refinement
+
+Usage: python experiments/deep_chain.py [n]
+"""
+import sys
+from time import perf_counter
+
+from hdict import hdict, apply, _
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def f(x):
+    return x + 1
+
+
+start = perf_counter()
+d = hdict(x=0)
+for _i in range(n):
+    d >>= apply(f, _.x).x
+built = perf_counter()
+print(f"building:   {(built - start) / n * 1e6:8.2f}µs/step")
+
+assert d.x == n
+evaluated = perf_counter()
+print(f"evaluating: {(evaluated - built) / n * 1e6:8.2f}µs/step  (recursion limit: {sys.getrecursionlimit()})")
+
+# Direct Python calls, as the lower bound for the per-step overhead.
+x = 0
+for _i in range(n):
+    x = f(x)
+print(f"plain loop: {(perf_counter() - evaluated) / n * 1e6:8.2f}µs/step")
@@ -0,0 +1,24 @@
+"""
+Construction of an hdict from many large arrays, hashed sequentially and concurrently
+
+Usage: python experiments/parallel_construction.py [number of arrays] [MB per array]
+"""
+import sys
+from os import cpu_count
+from time import perf_counter
+
+import numpy as np
+
+from hdict import hdict
+from hdict.content.aux_value import set_parallel_hashing
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+mb = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+rnd = np.random.default_rng(0)
+arrays = {f"a{i}": rnd.random(mb * 2**20 // 8) for i in range(n)}
+
+for workers in [1, cpu_count()]:
+    set_parallel_hashing(workers=workers)
+    start = perf_counter()
+    d = hdict(arrays)
+    print(f"{workers:3} worker(s): {perf_counter() - start:6.2f}s  {d.id}")
@@ -23,6 +23,7 @@
 from typing import TypeVar
 
 from hdict.content.argument.apply import apply
+from hdict.content.aux_value import register_hasher
 from hdict.content.argument.field import field
 from hdict.content.argument.sample import sample
 from hdict.data.empty_ import Empty_
@@ -32,7 +33,7 @@ from hdict.data.hdict_ import hdict_
 from hdict.data.self_ import Self_
 from hdict.expression.step.cache import cache
 
-__all__ = ["hdict", "_", "Ø", "apply", "field", "sample", "frozenhdict", "value", "cache"]
+__all__ = ["hdict", "_", "Ø", "apply", "field", "sample", "frozenhdict", "value", "cache", "register_hasher"]
 
 VT = TypeVar("VT")
 
@@ -260,7 +260,7 @@ class apply(AbsBaseArgument):
     _sampleable, isfield, _requirements = None, False, None
 
     def __init__(self, appliable: callable | apply | field, *applied_args, fhosh: Hosh = None, _sampleable=None, **applied_kwargs):
-        from hdict.content.argument.aux_apply import handle_args
+        from hdict.content.argument.aux_apply import handle_args, layout, function_layout
 
         self.appliable = appliable
         if isinstance(fhosh, str):  # pragma: no cover
@@ -289,7 +289,7 @@ class apply(AbsBaseArgument):
                 if not hasattr(appliable, "hosh"):  # pragma: no cover
                     raise Exception(f"Missing 'hosh' attribute while applying custom callable class '{type(appliable).__name__}'")
                 # noinspection PyUnresolvedReferences
-                sig = signature(appliable.__call__)
+                lay = layout(signature(appliable.__call__))
                 # noinspection PyUnresolvedReferences
                 self.fhosh = fhosh or appliable.hosh
             else:
@@ -298,10 +298,10 @@ class apply(AbsBaseArgument):
                 if s.startswith("<built-in function"):
                     if s.endswith("getattr>"):
                         self.appliable = appliable = getattr_
-                sig = signature(appliable)
+                lay = function_layout(appliable)
 
             # Separate positional parameters from named parameters looking at 'f' signature.
-            self.fargs, self.fkwargs = handle_args(sig, applied_args, applied_kwargs)
+            self.fargs, self.fkwargs = handle_args(lay, applied_args, applied_kwargs)
             self._sampleable = _sampleable
         else:  # pragma: no cover
             raise Exception(f"Cannot apply type '{type(appliable).__name__}'.")
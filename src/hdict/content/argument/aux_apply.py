@@ -1,18 +1,10 @@
-from indexed import IndexedOrderedDict
+from dataclasses import dataclass
+from inspect import signature as inspect_signature, Parameter
+from weakref import WeakKeyDictionary
 
 from hdict.content.argument import AbsArgument
 
-
-class IndexedDict(IndexedOrderedDict):
-    """
-    Wrapper with a cleaner repr(esentation) of IndexedOrderedDict.
-
-    >>> IndexedDict([('a', 'a'), ('b', 'b')])
-    {'a': 'a', 'b': 'b'}
-    """
-
-    def __repr__(self):
-        return repr(dict(self.items()))
+_layouts = WeakKeyDictionary()  # code object -> {defaults: Layout}
 
 
 class Arg(str):
@@ -37,16 +29,70 @@ class Arg(str):
         return f"arg_{self.position}"
 
 
-def handle_args(signature, applied_args, applied_kwargs):
+@dataclass(frozen=True)
+class Layout:
+    """
+    Parameters of a function, as needed to match them against the arguments of `apply()`
+
+    >>> layout(inspect_signature(lambda a, b=2, *args, c, **kwargs: None))
+    Layout(required=('a', 'c'), defaults=(('b', 2),), params=('a', 'b', 'c'), hasargs=True, haskwargs=True)
+    """
+
+    required: tuple  # Parameters without default value, in order.
+    defaults: tuple  # (name, default value) pairs, in order.
+    params: tuple  # All named parameters, in order.
+    hasargs: bool
+    haskwargs: bool
+
+
+def layout(signature):
+    required, defaults, params = [], [], []
+    hasargs, haskwargs = False, False
+    for par in signature.parameters.values():
+        if par.kind is Parameter.VAR_KEYWORD:
+            haskwargs = True
+            continue
+        elif par.kind is Parameter.VAR_POSITIONAL:
+            hasargs = True
+            continue
+        if par.default is par.empty:
+            required.append(par.name)
+        else:
+            defaults.append((par.name, par.default))
+        params.append(par.name)
+    return Layout(tuple(required), tuple(defaults), tuple(params), hasargs, haskwargs)
+
+
+def function_layout(function):
+    """
+    `Layout` of a callable, cached for plain functions by code object and (immutable) default values
+
+    >>> f, g = [lambda x, y=1: x for _ in range(2)]  # Distinct functions sharing a code object.
+    >>> f is not g and function_layout(f) is function_layout(g)
+    True
+    """
+    from hdict.content.aux_value import functionkey
+
+    if (key := functionkey(function)) is None:
+        return layout(inspect_signature(function))
+    code, defaults = key
+    if (lay := _layouts.get(code, {}).get(defaults)) is None:
+        lay = layout(inspect_signature(function))
+        _layouts.setdefault(code, {})[defaults] = lay
+    return lay
+
+
+def handle_args(layout: Layout | None, applied_args, applied_kwargs):
     from hdict.content.argument.field import field
     from hdict.content.value import value
 
     # Separate positional from named parameters of 'f'.
-    fargs, fkwargs = IndexedDict(), {}
-    params = []
-    hasargs, haskwargs = False, False
-    if signature is None:
+    # `keys` keeps the insertion order of `fargs`, to find positional arguments by index.
+    fargs, fkwargs, keys = {}, {}, []
+    if layout is None:
         # Applying a field.
+        params = []
+        hasargs, haskwargs = False, False
         for i, v in enumerate(applied_args):
             fargs[i] = v
             params.append(i)
@@ -54,30 +100,21 @@ def handle_args(signature, applied_args, applied_kwargs):
             fkwargs[k] = v
             params.append(k)
     else:
-        for par in signature.parameters.values():
-            strpar = str(par)
-            if strpar.startswith("**"):
-                haskwargs = True
-                continue
-            elif strpar.startswith("*"):
-                hasargs = True
-                continue
-            name = par.name
-            if (v := par.default) is par.empty:
-                fargs[name] = field(name)
-            else:
-                from hdict.content.argument.default import default
+        from hdict.content.argument.default import default
 
-                fkwargs[name] = default(v)
-            params.append(name)
+        params, hasargs, haskwargs = layout.params, layout.hasargs, layout.haskwargs
+        for name in layout.required:
+            fargs[name] = field(name)
+        for name, v in layout.defaults:
+            fkwargs[name] = default(v)
+    keys.extend(fargs)
 
     # apply's entry override f's entry
     wrap = lambda x: x if isinstance(x, AbsArgument) else value(x)
     used = set()
     for i, applied_arg in enumerate(applied_args):
         if i < len(fargs):
-            # noinspection PyUnresolvedReferences
-            used.add(key := fargs.keys()[i])
+            used.add(key := keys[i])
             fargs[key] = wrap(applied_arg)
         else:
             if i >= len(params):
@@ -88,6 +125,8 @@ def handle_args(signature, applied_args, applied_kwargs):
                 name = Arg(i) if hasargs and i >= len(fargs) else params[i]
                 if name in fkwargs:
                     del fkwargs[name]
+            if name not in fargs:
+                keys.append(name)
             fargs[name] = wrap(applied_arg)
 
     for applied_kwarg, v in applied_kwargs.items():
@@ -23,11 +23,46 @@
 
 import dis
 import re
-from collections import OrderedDict
+import sys
+from collections import OrderedDict, namedtuple
 from inspect import signature, isbuiltin, isclass
-from pickle import dumps
+from pickle import dumps, Pickler, PickleBuffer
+from struct import pack
+from threading import RLock
+from types import FunctionType
+from weakref import ref, WeakKeyDictionary
 
+from blake3 import blake3
 from hosh import Hosh, ø
+from hosh.groups import UT40_4
+
+# Values with at least this many bytes are pickled directly into the hasher, instead of into an intermediate copy.
+STREAMING_THRESHOLD = 2**20
+
+_hashers = {}  # type or "module.QualName" -> (function, cache)
+_resolved = {}  # type -> (function, cache) | None
+_cache = {}  # id(object) -> (weak reference, hosh)
+
+# Hoshes of small primitive values, e.g., hyperparameters; the oldest ones are dropped first.
+INTERN_SIZE = 2**16
+_interned = {}  # (type, value) -> hosh
+_interned_stats = {"hits": 0, "misses": 0}
+PRIMITIVES = {int, float, bool, str, bytes, tuple, type(None)}
+
+# Whether sets and dicts are hashed regardless of their iteration order; see `set_canonical_hashing()`.
+_canonical = {"enabled": False}
+
+# Values with at least `threshold` bytes are hashed concurrently when building an hdict; `workers=None` means one per CPU.
+_parallel_hashing = {"threshold": STREAMING_THRESHOLD, "workers": None}
+
+# Bytes pickled while hashing values, to be reused when storing them; disabled while `max_bytes` is None.
+_pickles = OrderedDict()  # id(object) -> (weak or strong reference, bytes)
+_pickles_budget = {"max_bytes": None, "total": 0}
+_pickles_lock = RLock()
+
+_f2hosh_cache = WeakKeyDictionary()  # code object -> {(defaults, kwdefaults): hosh}
+_f2hosh_stats = {"hits": 0, "misses": 0}
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
 
 
 def v2hosh(value: object) -> Hosh:
@@ -46,20 +81,441 @@ def v2hosh(value: object) -> Hosh:
     >>> print(v2hosh(obj))
     My-custom-identifier-arbitrarily-defined
     """
+    if type(value) in PRIMITIVES and (key := internkey(value)) is not None:
+        return interned(key, value)
     if hasattr(value, "hosh"):
         return value.hosh
+    elif (found := hasher(type(value))) is not None:
+        function, cache = found
+        return cachedhosh(value, function) if cache else function(value)
     else:
         try:
             if callable(value):
                 return f2hosh(value)
-            # REMINDER: pickle is the fastest serialization
-            return Hosh(dumps(value, protocol=5))
+            if _canonical["enabled"] and isinstance(value, CONTAINERS) and (c := canonical(value)) is not value:
+                return Hosh(dumps(c, protocol=5))
+            return pickle2hosh(value)
         except TypeError as e:  # pragma: no cover
             if "disassemble _PredictScorer" in str(e) or "disassemble _ProbaScorer" in str(e):
                 return Hosh(dumps(value, protocol=5))
             raise Exception(f"Cannot pickle. Pickling is needed to hosh hdict values ({value}): {e}")
 
 
+def internkey(value):
+    """
+    Key of a small primitive value (or tuple of them) for the intern table; `None` for other values
+
+    Types are part of the key, since `1 == 1.0 == True`.
+    Floats are keyed by their bits, as pickled: `0.0` and `-0.0` differ, and a NaN matches itself (`nan != nan`).
+
+    >>> internkey(1) != internkey(1.0) != internkey(True), internkey(0.0) != internkey(-0.0)
+    (True, True)
+    >>> nan = float("nan")
+    >>> internkey(nan) == internkey(float("nan")) != internkey(-nan), v2hosh(nan) == v2hosh(float("nan"))
+    (True, True)
+    >>> internkey((1, "a")), internkey([1]), internkey("x" * 100), internkey(2 ** 64), internkey((1, 2 ** 64))
+    ((<class 'tuple'>, ((<class 'int'>, 1), (<class 'str'>, 'a'))), None, None, None, None)
+    """
+    t = type(value)
+    if t is float:
+        return t, pack("<d", value)
+    if t is tuple:
+        if len(value) > 8:
+            return None
+        keys = []
+        for item in value:
+            if type(item) is tuple or type(item) not in PRIMITIVES or (key := internkey(item)) is None:
+                return None
+            keys.append(key)
+        return t, tuple(keys)
+    if t is int:
+        return (t, value) if value.bit_length() <= 64 else None
+    if t is str or t is bytes:
+        return (t, value) if len(value) <= 64 else None
+    return (t, value) if t in PRIMITIVES else None
+
+
+def interned(key, value):
+    """Hosh of a value given its intern key, calculated only on the first request; see `internkey()`"""
+    if (hosh := _interned.get(key)) is not None:
+        _interned_stats["hits"] += 1
+        return hosh
+    _interned_stats["misses"] += 1
+    hosh = pickle2hosh(value)
+    if len(_interned) >= INTERN_SIZE:
+        _interned.pop(next(iter(_interned), None), None)
+    _interned[key] = hosh
+    return hosh
+
+
+def intern_info():
+    """
+    Hits, misses and number of interned hoshes of small primitive values
+
+    >>> before = intern_info()
+    >>> v2hosh(("rbf", 0.1)) == v2hosh(("rbf", 0.1)) == Hosh(dumps(("rbf", 0.1), protocol=5))
+    True
+    >>> intern_info().hits - before.hits >= 1
+    True
+    """
+    return CacheInfo(_interned_stats["hits"], _interned_stats["misses"], len(_interned))
+
+
+CONTAINERS = (set, frozenset, dict, list, tuple)
+CANONICAL = "»hdict·CANONICAL«"
+
+
+def set_canonical_hashing(enabled=True):
+    """
+    Hash sets, frozensets and dicts (also nested inside lists and tuples) independently of their iteration order
+
+    Set order depends on `PYTHONHASHSEED`, and so would ids of values containing sets of strings.
+    Ids of values without sets and dicts are not affected.
+    Disabled by default, since equal dicts with different insertion orders would then get the same id.
+
+    >>> a, b = {"x": {"b", "a"}, "y": [1, {"k": 2, "j": 3}]}, {"y": [1, {"j": 3, "k": 2}], "x": {"a", "b"}}
+    >>> v2hosh(a) == v2hosh(b)
+    False
+    >>> set_canonical_hashing()
+    >>> v2hosh(a) == v2hosh(b), v2hosh([1, (2, "3")]) == pickle2hosh([1, (2, "3")])
+    (True, True)
+    >>> v2hosh({1, 2}) == v2hosh(frozenset({1, 2})), v2hosh({"a": 1}) == v2hosh(OrderedDict({"a": 1}))
+    (False, False)
+    >>> set_canonical_hashing(False)
+    """
+    _canonical["enabled"] = enabled
+
+
+def canonical(value):
+    """
+    Equivalent of `value` with sets and dicts replaced by tagged tuples sorted by the pickled bytes of their items
+
+    The same object is returned when there is nothing to replace.
+    Subclasses, e.g. `OrderedDict`, are left untouched, since their order may be part of their equality.
+
+    >>> a, b = OrderedDict([("a", 1), ("b", 2)]), OrderedDict([("b", 2), ("a", 1)])
+    >>> canonical(a) is a, canonical([{"x": 1}, a])[2][1] is a
+    (True, True)
+    >>> set_canonical_hashing()
+    >>> v2hosh(a) == v2hosh(b)
+    False
+    >>> set_canonical_hashing(False)
+    """
+    if type(value) in (list, tuple):
+        items = [canonical(v) for v in value]
+        if all(c is v for c, v in zip(items, value)):
+            return value
+        return CANONICAL, type(value), tuple(items)
+    if type(value) in (set, frozenset):
+        items = value
+    elif type(value) is dict:
+        items = ((k, v) for k, v in value.items())
+    else:
+        return value
+    return CANONICAL, type(value), tuple(sorted((canonical(item) for item in items), key=lambda c: dumps(c, protocol=5)))
+
+
+def register_hasher(cls, function=None, cache=False):
+    """
+    Define how values of a given type (and its subtypes) are converted to hosh objects by `v2hosh()`
+
+    This avoids pickling heavy objects or the need to assign a `hosh` attribute to them.
+    `cls` can also be a string "module.QualName", so that the type does not need to be imported beforehand.
+    With `cache=True`, the hosh is reused while the same object is alive; only intended for objects that are not mutated.
+    Can be used as a decorator when `function` is omitted.
+
+    >>> from hdict import hdict, register_hasher
+    >>> class Model:
+    ...     def __init__(self, name, weights):
+    ...         self.name, self.weights = name, weights
+    >>> @register_hasher(Model)
+    ... def model2hosh(model):
+    ...     return Hosh(model.name.encode())
+    >>> hdict(m=Model("resnet", [0.1] * 1000)).ids["m"] == Hosh(b"resnet").id
+    True
+
+    Subtypes are covered, unless they have a hasher of their own.
+
+    >>> class BigModel(Model):
+    ...     pass
+    >>> v2hosh(BigModel("resnet", [])) == v2hosh(Model("resnet", []))
+    True
+
+    Cached hoshes are kept by object identity.
+
+    >>> calls = []
+    >>> register_hasher(BigModel, lambda m: calls.append(1) or Hosh(m.name.encode()), cache=True)
+    >>> m = BigModel("vgg", [])
+    >>> v2hosh(m) == v2hosh(m), calls
+    (True, [1])
+    """
+    if function is None:
+        return lambda function: register_hasher(cls, function, cache) or function
+    _hashers[cls] = function, cache
+    _resolved.clear()
+
+
+def hasher(cls):
+    """Registered (function, cache) pair for the given type, according to its MRO; or `None`"""
+    try:
+        return _resolved[cls]
+    except KeyError:
+        # Names can also be public aliases, e.g., "scipy.sparse.spmatrix" for "scipy.sparse._matrix.spmatrix".
+        aliases = {}
+        for name, item in _hashers.items():
+            if isinstance(name, str):
+                module, _, qualname = name.rpartition(".")
+                if (obj := getattr(sys.modules.get(module), qualname, None)) is not None:
+                    aliases[obj] = item
+        found = None
+        for c in cls.__mro__:
+            if (found := _hashers.get(c) or _hashers.get(f"{c.__module__}.{c.__qualname__}") or aliases.get(c)) is not None:
+                break
+        _resolved[cls] = found
+        return found
+
+
+def cachedhosh(value, function):
+    key = id(value)
+    if (item := _cache.get(key)) is not None and item[0]() is value:
+        return item[1]
+    hosh = function(value)
+    try:
+        _cache[key] = ref(value, lambda _, key=key: _cache.pop(key, None)), hosh
+    except TypeError:  # pragma: no cover
+        pass  # Not weakly referenceable.
+    return hosh
+
+
+def pickle2hosh(value):
+    """Hosh of the pickled value (protocol 5); large buffers are streamed into the hasher"""
+    if buffersize(value) >= STREAMING_THRESHOLD:
+        return stream2hosh(value)
+    # REMINDER: pickle is the fastest serialization
+    blob = dumps(value, protocol=5)
+    if _pickles_budget["max_bytes"] is not None:
+        keep_pickled(value, blob)
+    return Hosh(blob)
+
+
+def set_pickle_reuse(max_bytes=2**28):
+    """
+    Keep up to `max_bytes` of the bytes pickled to hash values, so that storages do not have to pickle them again
+
+    `None` disables it (default). See `pickled()`.
+    """
+    with _pickles_lock:
+        _pickles_budget["max_bytes"] = max_bytes
+        if max_bytes is None:
+            _pickles.clear()
+            _pickles_budget["total"] = 0
+
+
+def keep_pickled(value, blob):
+    """Remember the pickled bytes of a value, discarding the oldest ones beyond the limit set by `set_pickle_reuse()`"""
+    if (max_bytes := _pickles_budget["max_bytes"]) is None or len(blob) > max_bytes:
+        return
+    key = id(value)
+    try:
+        reference = ref(value, lambda _, key=key: forget_pickled(key))
+    except TypeError:
+        reference = lambda: value  # Not weakly referenceable: kept alive while its bytes are kept.
+    with _pickles_lock:
+        forget_pickled(key)
+        _pickles[key] = reference, blob
+        _pickles_budget["total"] += len(blob)
+        while _pickles_budget["total"] > max_bytes:
+            _, (_, old) = _pickles.popitem(last=False)
+            _pickles_budget["total"] -= len(old)
+
+
+def forget_pickled(key):
+    with _pickles_lock:
+        if (item := _pickles.pop(key, None)) is not None:
+            _pickles_budget["total"] -= len(item[1])
+
+
+def pickled(value):
+    """
+    Bytes pickled (protocol 5) when `value` was hashed, if still kept; they are handed over, i.e., forgotten
+
+    >>> set_pickle_reuse(max_bytes=1000)
+    >>> obj = {"x": [1, 2, 3]}
+    >>> _ = v2hosh(obj)
+    >>> pickled(obj) == dumps(obj, protocol=5), pickled(obj)
+    (True, None)
+    >>> set_pickle_reuse(None)
+    """
+    with _pickles_lock:
+        if (item := _pickles.get(id(value))) is not None and item[0]() is value:
+            forget_pickled(id(value))
+            return item[1]
+    return None
+
+
+def memoryview2hosh(value: memoryview):
+    """A memoryview is hashed as the bytes (or bytearray, if writable) it refers to"""
+    if not value.contiguous:
+        value = value.tobytes() if value.readonly else bytearray(value.tobytes())
+    return pickle2hosh(PickleBuffer(value))
+
+
+def sparse2hosh(value):
+    """
+    Hosh of a SciPy sparse matrix/array based on its canonical CSR components
+
+    Equal matrices have the same id regardless of format, duplicate entries, explicit zeros, index order or index dtype.
+    These ids differ from the ones of pickled sparse values, i.e., from those of values stored by hdict before this hasher existed.
+    A matrix already in canonical CSR format is hashed in place; other formats are converted to it first.
+    Indices are hashed as int64, converted in chunks.
+
+    >>> from scipy.sparse import coo_matrix, csr_array
+    >>> a = coo_matrix(([1.0, 1.0, 3.0], ([0, 0, 1], [2, 2, 0])), shape=(2, 3))
+    >>> b = coo_matrix(([3.0, 2.0], ([1, 0], [0, 2])), shape=(2, 3))
+    >>> v2hosh(a) == v2hosh(b) == v2hosh(b.tocsc()) == v2hosh(b.tocsr())
+    True
+    >>> v2hosh(a) == v2hosh(b * 2), v2hosh(csr_array(b)) == v2hosh(csr_array(a))
+    (False, True)
+    """
+    from numpy import ascontiguousarray, int64
+
+    m = value
+    if m.format != "csr" or not m.has_canonical_format or m.count_nonzero() != m.nnz:
+        m = m.tocsr(copy=True)
+        m.sum_duplicates()
+        m.sort_indices()
+        m.eliminate_zeros()
+    hasher = blake3(max_threads=blake3.AUTO)
+    hasher.update(dumps(("scipy.sparse", type(m).__name__, m.shape, str(m.dtype)), protocol=5))
+    for indices in (m.indptr, m.indices):
+        hasher.update(len(indices).to_bytes(8, "little"))
+        for i in range(0, len(indices), STREAMING_THRESHOLD):
+            hasher.update(memoryview(ascontiguousarray(indices[i : i + STREAMING_THRESHOLD], dtype=int64)).cast("B"))
+    hasher.update(memoryview(ascontiguousarray(m.data)).cast("B"))
+    return digest2hosh(hasher.digest(length=UT40_4.bytes))
+
+
+register_hasher(memoryview, memoryview2hosh)
+register_hasher("numpy.ndarray", pickle2hosh)
+register_hasher("pandas.core.generic.NDFrame", pickle2hosh)
+register_hasher("pandas.core.indexes.base.Index", pickle2hosh)
+register_hasher("scipy.sparse.spmatrix", sparse2hosh)
+register_hasher("scipy.sparse.sparray", sparse2hosh)
+
+
+def buffersize(value):
+    """Number of bytes of a buffer-like value (bytes, NumPy arrays, ...); 0 for other values"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, PickleBuffer):
+        return value.raw().nbytes
+    nbytes = getattr(value, "nbytes", 0)
+    return nbytes if isinstance(nbytes, int) else 0
+
+
+class HashWriter:
+    """File-like object that feeds a blake3 hasher, receiving out-of-band buffers from pickle without copying them"""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+
+    def write(self, data):
+        self.hasher.update(data.raw() if isinstance(data, PickleBuffer) else data)
+
+
+class TeeHashWriter(HashWriter):
+    """HashWriter that also keeps a copy of what is written"""
+
+    def __init__(self, hasher):
+        super().__init__(hasher)
+        self.buffer = bytearray()
+
+    def write(self, data):
+        super().write(data)
+        self.buffer += data.raw() if isinstance(data, PickleBuffer) else data
+
+    def getvalue(self):
+        return bytes(self.buffer)
+
+
+def stream2hosh(value: object) -> Hosh:
+    """
+    Same as `Hosh(dumps(value, protocol=5))`, without holding the pickled value in memory
+
+    Large buffers (bytes, NumPy arrays, ...) are hashed in place using multiple threads.
+
+    >>> import numpy as np
+    >>> a = np.arange(1_000_000).reshape(1000, 1000)
+    >>> stream2hosh(a) == Hosh(dumps(a, protocol=5))
+    True
+    >>> stream2hosh(a.T) == Hosh(dumps(a.T, protocol=5))
+    True
+    >>> v2hosh(memoryview(b"abc")) == v2hosh(b"abc")
+    True
+    """
+    hasher = blake3(max_threads=blake3.AUTO)
+    max_bytes = _pickles_budget["max_bytes"]
+    if max_bytes is not None and buffersize(value) <= max_bytes:
+        # The pickled bytes are also gathered, to be reused when storing the value.
+        writer = TeeHashWriter(hasher)
+        Pickler(writer, protocol=5).dump(value)
+        keep_pickled(value, writer.getvalue())
+    else:
+        Pickler(HashWriter(hasher), protocol=5).dump(value)
+    return digest2hosh(hasher.digest(length=UT40_4.bytes))
+
+
+def digest2hosh(digest: bytes) -> Hosh:
+    """Ordered Hosh object from a blake3 digest, like `Hosh(blob)` does with `blake3(blob).digest()`"""
+    p = UT40_4.p
+    n = int.from_bytes(digest, byteorder="little") >> 1
+    return Hosh.fromn((p**4 + n) % p**6)
+
+
+def set_parallel_hashing(threshold=STREAMING_THRESHOLD, workers=None):
+    """
+    Configure the concurrent hashing of large values when building an hdict; see `v2hoshes()`
+
+    `workers=1` disables it. `workers=None` means one thread per CPU.
+    """
+    _parallel_hashing.update(threshold=threshold, workers=workers)
+
+
+def hashing_workers(n):
+    """Number of threads to hash `n` large values"""
+    from os import cpu_count
+
+    workers = _parallel_hashing["workers"] or cpu_count() or 1
+    return min(workers, n)
+
+
+def v2hoshes(values: dict) -> dict:
+    """
+    Hoshes of the large buffer-like values (NumPy arrays, bytes, ...) of a dict, calculated concurrently
+
+    The hasher releases the GIL while digesting their buffers.
+    Other values, and all values when there are not enough of them or workers, are left out of the result.
+
+    >>> import numpy as np
+    >>> set_parallel_hashing(threshold=1000, workers=2)
+    >>> values = {"a": np.zeros(1000), "b": np.ones(1000), "c": 3}
+    >>> hoshes = v2hoshes(values)
+    >>> list(hoshes), hoshes["b"] == v2hosh(values["b"])
+    (['a', 'b'], True)
+    >>> set_parallel_hashing()
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from hdict.abs import AbsAny
+
+    threshold = _parallel_hashing["threshold"]
+    large = [k for k, v in values.items() if not isinstance(v, AbsAny) and buffersize(v) >= threshold]
+    if len(large) < 2 or (workers := hashing_workers(len(large))) < 2:
+        return {}
+    with ThreadPoolExecutor(workers) as pool:
+        hoshes = list(pool.map(v2hosh, (values[k] for k in large)))
+    return dict(zip(large, hoshes))
+
+
 def f2hosh(function: callable):
     """
     Convert a function to a hosh object.
@@ -72,11 +528,72 @@ def f2hosh(function: callable):
     >>> fun.hosh = ø * "My-custom-identifier-arbitrarily-defined"
     >>> print(f2hosh(fun))
     My-custom-identifier-arbitrarily-defined
+
+    Plain functions are cached by code object and defaults, since disassembling is slow.
+
+    >>> before = f2hosh_cache_info()
+    >>> f2hosh(lambda x, y=1: x + y) == f2hosh(lambda x, y=1: x + y)  # Same code in the same line: equal code objects.
+    True
+    >>> f2hosh_cache_info().hits - before.hits, f2hosh_cache_info().misses - before.misses
+    (1, 1)
     """
     if hasattr(function, "hosh"):
         return function.hosh
     if isbuiltin(function) or isclass(function):
         return Hosh(str(function).encode())
+    if (key := functionkey(function)) is None:
+        return bytecode2hosh(function)
+    code, defaults = key
+    if (hosh := _f2hosh_cache.get(code, {}).get(defaults)) is not None:
+        _f2hosh_stats["hits"] += 1
+        return hosh
+    _f2hosh_stats["misses"] += 1
+    hosh = bytecode2hosh(function)
+    _f2hosh_cache.setdefault(code, {})[defaults] = hosh
+    return hosh
+
+
+def f2hosh_cache_info():
+    """Hits, misses and number of cached code objects of `f2hosh()`"""
+    return CacheInfo(_f2hosh_stats["hits"], _f2hosh_stats["misses"], len(_f2hosh_cache))
+
+
+_nokey = object()
+
+
+def functionkey(function):
+    """
+    (code object, defaults) that determine the hosh of a plain function; `None` for other callables or mutable defaults
+
+    >>> functionkey(lambda x=1: x)[1]
+    (((<class 'int'>, 1),), None)
+    >>> functionkey(lambda x=[]: x) is None
+    True
+    """
+    if type(function) is not FunctionType or hasattr(function, "__wrapped__") or hasattr(function, "__signature__"):
+        return None
+    kwdefaults = function.__kwdefaults__
+    defaults = freeze(function.__defaults__), freeze(None if kwdefaults is None else tuple(kwdefaults.items()))
+    if _nokey in defaults:
+        return None
+    return function.__code__, defaults
+
+
+def freeze(obj):
+    """Type-tagged key for immutable defaults, distinguishing equal values that pickle differently, e.g., 1, 1.0, True"""
+    if obj is None:
+        return None
+    if type(obj) in (bool, int, str, bytes):
+        return type(obj), obj
+    if type(obj) is float:
+        return float, repr(obj)  # Also distinguishes -0.0 from 0.0.
+    if type(obj) is tuple:
+        items = tuple(freeze(item) for item in obj)
+        return _nokey if _nokey in items else items
+    return _nokey
+
+
+def bytecode2hosh(function: callable):
     fields_and_params = signature(function).parameters.values()
     fields_and_params = {v.name: None if v.default is v.empty else v.default for v in fields_and_params}
 
@@ -0,0 +1,85 @@
+from hosh import Hosh
+
+from hdict.content.aux_value import v2hosh
+from hdict.content.value import value
+
+
+class chunked(value):
+    """
+    Value identified by the ids of its consecutive chunks of `chunk_rows` rows (list, tuple, NumPy array or DataFrame)
+
+    The id is the ordered product of the chunk hoshes, so appending rows only hashes the new (and the last partial) chunks.
+    Ids of already hashed complete chunks can be provided through `chunk_ids`, e.g., when resuming in another process.
+
+    >>> import numpy as np
+    >>> v = value.chunked(np.arange(10), chunk_rows=4)
+    >>> v.chunk_ids == [v2hosh(np.arange(4)).id, v2hosh(np.arange(4, 8)).id]
+    True
+    >>> w = v.append(np.arange(10, 13))
+    >>> w.value
+    array([ 0,  1,  2,  3,  4,  5,  6,  7,  8,  9, 10, 11, 12])
+    >>> w.id == value.chunked(np.arange(13), chunk_rows=4).id != v.id
+    True
+    >>> value.chunked(np.arange(13), chunk_rows=4, chunk_ids=w.chunk_ids[:2]).id == w.id
+    True
+    >>> from pandas import DataFrame
+    >>> df = DataFrame({"a": range(5)})
+    >>> value.chunked(df.iloc[:3], 2).append(df.iloc[3:]).id == value.chunked(df, 2).id
+    True
+    """
+
+    def __init__(self, val: object, chunk_rows: int, chunk_ids: list = None):
+        if chunk_rows < 1:  # pragma: no cover
+            raise Exception(f"`chunk_rows` should be positive, not {chunk_rows}.")
+        self.chunk_rows = chunk_rows
+        # Product of the hoshes of the complete chunks, starting with a tag for the chunk size.
+        self.prefix = Hosh(f"»hdict·CHUNKED«{chunk_rows}".encode())
+        self.chunk_ids = []
+        self.extend(val, chunk_ids or [])
+        super().__init__(val, hosh=self.combine(val))
+
+    def extend(self, val, chunk_ids):
+        """Account for the complete chunks of `val` beyond the already known ones"""
+        start = len(self.chunk_ids) * self.chunk_rows
+        for start in range(start, len(val) - self.chunk_rows + 1, self.chunk_rows):
+            i = len(self.chunk_ids)
+            hosh = Hosh.fromid(chunk_ids[i]) if i < len(chunk_ids) else v2hosh(rows(val, start, start + self.chunk_rows))
+            self.prefix *= hosh
+            self.chunk_ids.append(hosh.id)
+
+    def combine(self, val):
+        """Hosh of the complete chunks followed by the remaining rows of `val`, if any"""
+        start = len(self.chunk_ids) * self.chunk_rows
+        if start == len(val):
+            return self.prefix
+        return self.prefix * v2hosh(rows(val, start, len(val)))
+
+    def calculate_hosh(self):
+        return self.combine(self.value)
+
+    def append(self, new_rows):
+        """New chunked value with the given rows appended; only the new chunks are hashed"""
+        new = object.__new__(chunked)
+        new.chunk_rows, new.prefix, new.chunk_ids = self.chunk_rows, self.prefix, self.chunk_ids.copy()
+        val = concat(self.value, new_rows)
+        new.extend(val, [])
+        value.__init__(new, val, hosh=new.combine(val))
+        return new
+
+
+def rows(val, start, stop):
+    if hasattr(val, "iloc"):  # pandas
+        return val.iloc[start:stop]
+    return val[start:stop]
+
+
+def concat(val, new_rows):
+    if isinstance(val, (list, tuple)):
+        return val + type(val)(new_rows)
+    if hasattr(val, "iloc"):
+        from pandas import concat
+
+        return concat([val, new_rows])
+    from numpy import concatenate
+
+    return concatenate([val, new_rows])
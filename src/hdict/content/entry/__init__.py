@@ -21,6 +21,7 @@
 #  time spent here.
 #
 from dataclasses import dataclass
+from threading import Lock
 from typing import Callable
 
 from hosh import Hosh
@@ -33,6 +34,40 @@ class Unevaluated:
     pass
 
 
+# Guards the lazy creation of per-entry locks.
+_locks_lock = Lock()
+
+_lazy_identity = False
+
+
+def set_lazy_identity(enabled=True):
+    """
+    Defer hashing of entries and hdicts until their ids are first requested (`.id`, `.ids`, `.hosh`, `==`, caching...)
+
+    Ids are the same as in the default (eager) mode; they are only computed later, and at most once.
+    Disabled by default.
+
+    >>> from hdict import hdict, apply
+    >>> eager = hdict(x=[1, 2]) >> apply(lambda x: len(x)).y
+    >>> set_lazy_identity()
+    >>> d = hdict(x=[1, 2]) >> apply(lambda x: len(x)).y
+    >>> d.raw["x"]._hosh is None, d.frozen._hosh is None
+    (True, True)
+    >>> d.y, d.raw["x"]._hosh is None, d.raw["y"]._hosh is None  # Evaluation does not require ids.
+    (2, True, True)
+    >>> d.ids == eager.ids, d.id == eager.id
+    (True, True)
+    >>> set_lazy_identity(False)
+    """
+    global _lazy_identity
+    _lazy_identity = enabled
+
+
+def islazy():
+    """Whether identities are being computed on demand; see `set_lazy_identity()`"""
+    return _lazy_identity
+
+
 class AbsEntry(AbsAny):
     """
     hdict final entry at internal level: value*, SubValue, Closure
@@ -43,6 +78,40 @@ class AbsEntry(AbsAny):
     value: object | Callable  # REMINDER: 'callable' is here for appliable contents, like storing a raw lambda
     hosh: Hosh
     _value = Unevaluated()
+    _hosh = None
+    _lock = None
+    compacted = False  # Compacted entries cannot be recomputed, so they are never evicted/freed.
+
+    @property
+    def hosh(self):
+        if (hosh := self._hosh) is None:
+            # Deferred identities are calculated deepest first, so long chains do not nest calls.
+            stack, visited = [(self, iter(self.sources))], {id(self)}
+            while stack:
+                node, sources = stack[-1]
+                for source in sources:
+                    if source._hosh is None and id(source) not in visited:
+                        visited.add(id(source))
+                        stack.append((source, iter(source.sources)))
+                        break
+                else:
+                    stack.pop()
+                    node._hosh = node.calculate_hosh()
+            hosh = self._hosh
+        return hosh
+
+    @hosh.setter
+    def hosh(self, hosh):
+        self._hosh = hosh
+
+    @property
+    def sources(self):
+        """Entries whose hoshes are needed to calculate this one's"""
+        return ()
+
+    def calculate_hosh(self):  # pragma: no cover
+        """Identity of an entry whose hosh was not provided/computed at construction; see `set_lazy_identity()`"""
+        raise NotImplementedError
 
     @property
     def id(self):  # pragma: no cover
@@ -51,6 +120,63 @@ class AbsEntry(AbsAny):
     def evaluate(self):
         _ = self.value
 
+    @property
+    def dependencies(self):
+        """Entries that should be evaluated before this one"""
+        return ()
+
+    def compact(self):
+        """Drop references only needed to (re)compute the value of an evaluated entry"""
+        pass
+
+    @property
+    def lock(self):
+        """
+        Per-entry lock to evaluate it only once when many threads ask for its value at the same time
+
+        It is only created when the entry is first evaluated; evaluated entries are read without locking.
+
+        >>> from threading import Thread
+        >>> from time import sleep
+        >>> from hdict import hdict, apply
+        >>> calls = []
+        >>> def fit(x):
+        ...     calls.append(x)
+        ...     sleep(0.1)
+        ...     return x * 2
+        >>> d = hdict(x=3) >> apply(fit).y
+        >>> threads = [Thread(target=lambda: d.y) for _i in range(4)]
+        >>> for t in threads:
+        ...     t.start()
+        >>> for t in threads:
+        ...     t.join()
+        >>> d.y, calls
+        (6, [3])
+        """
+        if (lock := self._lock) is None:
+            with _locks_lock:
+                if (lock := self._lock) is None:
+                    lock = self._lock = Lock()
+        return lock
+
+    def evaluate_upstream(self):
+        """
+        Evaluate all pending dependencies, deepest first
+
+        Each dependency finds its own dependencies already evaluated, so long chains do not nest calls.
+
+        >>> from hdict import hdict, apply, _
+        >>> d = hdict(x=0)
+        >>> for _i in range(2000):
+        ...     d >>= apply(lambda x: x + 1, _.x).x
+        >>> d.x
+        2000
+        """
+        from hdict.evaluation.graph import upstream
+
+        for node in upstream(self.dependencies):
+            node.evaluate()
+
     @property
     def isevaluated(self):
         """
@@ -1,7 +1,50 @@
 from __future__ import annotations
 
+from hosh import ø
+
 from hdict.content.argument import AbsBaseArgument
 
+# Maximum number of closure ids kept by `closure_hosh()`; the oldest ones are dropped first.
+CLOSURE_HOSH_MEMO_SIZE = 2**16
+
+_closure_hosh_memo = {}  # (n of each factor) -> product hosh
+_closure_hosh_stats = {"hits": 0, "misses": 0}
+
+
+def closure_hosh(factors):
+    """
+    Product of the hoshes of the (sorted) arguments and the applied function, memoized by their ranks
+
+    Rebuilding the same closure over inputs with the same ids costs only a dictionary lookup.
+
+    >>> from hosh import Hosh
+    >>> a, b, f = Hosh(b"a"), Hosh(b"b"), Hosh(b"f")
+    >>> before = closure_hosh_cache_info()
+    >>> closure_hosh([a, b, f]) == a * b * f, closure_hosh([a, b, f]) == a * b * f, closure_hosh([b, a, f]) == b * a * f
+    (True, True, True)
+    >>> closure_hosh_cache_info().hits - before.hits, closure_hosh_cache_info().misses - before.misses
+    (1, 2)
+    """
+    key = tuple(factor.n for factor in factors)
+    if (hosh := _closure_hosh_memo.get(key)) is not None:
+        _closure_hosh_stats["hits"] += 1
+        return hosh
+    _closure_hosh_stats["misses"] += 1
+    hosh = ø
+    for factor in factors:
+        hosh *= factor
+    if len(_closure_hosh_memo) >= CLOSURE_HOSH_MEMO_SIZE:
+        _closure_hosh_memo.pop(next(iter(_closure_hosh_memo), None), None)
+    _closure_hosh_memo[key] = hosh
+    return hosh
+
+
+def closure_hosh_cache_info():
+    """Hits, misses and number of memoized ids of `closure_hosh()`"""
+    from hdict.content.aux_value import CacheInfo
+
+    return CacheInfo(_closure_hosh_stats["hits"], _closure_hosh_stats["misses"], len(_closure_hosh_memo))
+
 
 def handle_arg(key, val, data, discarded_defaults, out, torepr, previous):
     """Return handled arg and value of pseudocircular entry"""
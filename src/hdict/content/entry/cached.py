@@ -1,6 +1,8 @@
 from hosh import Hosh
 
 from hdict.content.entry import AbsEntry, Unevaluated
+from hdict.evaluation.budget import tracked, touched
+from hdict.evaluation.registry import recall, remember
 
 
 def kindid(fid):
@@ -13,7 +15,25 @@ def getkind(storage, hosh):
 
 # TODO: fix id not found due to entry=None, might be caused by the entry having the value None
 class Cached(AbsEntry):
-    """Layer to enable delaying fetching from storage"""
+    """
+    Layer to enable delaying fetching from storage
+
+    The storage is queried once to know whether the value needs to be calculated and stored.
+
+    >>> from hdict import hdict, apply, cache
+    >>> class Storage(dict):
+    ...     queries = 0
+    ...     def __contains__(self, id):
+    ...         Storage.queries += 1
+    ...         return super().__contains__(id)
+    >>> storage = Storage()
+    >>> d = hdict(x=5) >> apply(lambda x: x * 2).y >> cache(storage)
+    >>> d.evaluate()
+    >>> d.y, Storage.queries, len(storage)
+    (10, 1, 1)
+    """
+
+    _stored = None  # Whether the id is in the storage; checked at most once until the entry is evaluated.
 
     def __init__(self, id: str, storage: dict, entry: AbsEntry = None):
         self.hosh = Hosh.fromid(id)
@@ -24,23 +44,55 @@ class Cached(AbsEntry):
     def kind(self):
         return getkind(self.storage, self.hosh)
 
+    @property
+    def dependencies(self):
+        # The entry is only needed when its content is not yet stored.
+        if self.entry is None or self.isstored:
+            return ()
+        return (self.entry,)
+
+    @property
+    def isstored(self):
+        """Whether the value is in the storage; remote storages are queried only once per evaluation"""
+        if self._stored is None:
+            self._stored = self.id in self.storage
+        return self._stored
+
+    def compact(self):
+        """Compact the wrapped entry; the cached value can still be evicted, since it can be refetched"""
+        if self.entry is not None:
+            self.entry.compact()
+
     @property
     def value(self):
         from hdict import frozenhdict
 
-        if isinstance(self._value, Unevaluated):
-            if self.entry and self.entry.isevaluated:
-                self._value = self.entry.value
-            elif (ret := frozenhdict.fetch(self.id, self.storage)) is not None:
-                self._value = ret
-            elif self.entry is None:  # pragma: no cover
-                raise Exception(f"id `{self.id}` not found.")
-            else:
-                from hdict.persistence.stored import Stored
-
-                self._value = self.entry.value
-                self.storage[self.id] = Stored(self._value)
-        return self._value
+        if isinstance(value := self._value, Unevaluated):
+            with self.lock:
+                if isinstance(value := self._value, Unevaluated):
+                    # Values that were not fetched are stored, even if the registry or a previous evaluation spared their computation.
+                    if self.entry and self.entry.isevaluated:
+                        value, store = self.entry.value, not self.isstored
+                    elif not isinstance(value := recall(self.id), Unevaluated):
+                        store = self.entry is not None and not self.isstored
+                    elif self.entry is not None and self._stored is False:  # Known from `dependencies`.
+                        value, store = self.entry.value, True
+                    elif (value := frozenhdict.fetch(self.id, self.storage)) is None:
+                        if self.entry is None:  # pragma: no cover
+                            raise Exception(f"id `{self.id}` not found.")
+                        value, store = self.entry.value, True
+                    else:
+                        store = False
+                    if store:
+                        from hdict.persistence.stored import stored
+
+                        self.storage[self.id] = stored(value, self.storage)
+                    self._value, self._stored = value, None
+                    remember(self.id, value)
+                    tracked(self)
+        else:
+            touched(self)
+        return value
 
     def __repr__(self):
         return f"↑↓ cached at `{type(self.storage).__name__}`·"
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from asyncio import run, get_running_loop
+from inspect import iscoroutine, iscoroutinefunction
 from itertools import chain
 
 from hdict.data.frozenhdict import frozenhdict
-from hosh import ø
+
+from hdict.evaluation.budget import tracked, touched
+from hdict.evaluation.registry import recall, remember, isregistered, registry_enabled
 
 from hdict.content.argument import AbsArgument
 from hdict.content.argument.apply import apply
 from hdict.content.argument.default import default
-from hdict.content.entry import AbsEntry, Unevaluated
-from hdict.content.entry.aux_closure import handle_arg
+from hdict.content.entry import AbsEntry, Unevaluated, islazy
+from hdict.content.entry.aux_closure import handle_arg, closure_hosh
 from hdict.text.customjson import truncate
 
 
@@ -20,7 +24,7 @@ class Closure(AbsEntry):
         self.application = application
         self.out = out
         self.torepr = {}
-        hosh = ø
+        args = []  # Arguments in the order their hoshes are multiplied.
         arg = None
         fargs, fkwargs, discarded_defaults = application.fargs.copy(), {}, set()  # We copy fargs to keep args order.
         sortable_fargs = zip(map(str, fargs), fargs.items())
@@ -33,11 +37,11 @@ class Closure(AbsEntry):
                 key, val = idx, tup
                 arg = handle_arg(key, val, data, discarded_defaults, out, self.torepr, previous)
                 fkwargs[key] = arg
-            hosh *= arg.hosh
+            args.append(arg)
 
+        self.fargs, self.fkwargs = fargs, fkwargs
         if application.isfield:
-            appliable_entry = handle_item(application.appliable.name, application.appliable, data, previous)
-            hosh *= appliable_entry.hosh.rev
+            self.appliable_entry = appliable_entry = handle_item(application.appliable.name, application.appliable, data, previous)
 
             def f():
                 args = (x.value for x in fargs.values())
@@ -49,7 +53,7 @@ class Closure(AbsEntry):
                         raise Exception(f"{str(e)}\n" f"HINT: If you are applying a field, " f"you should make the function parameters explicit, e.g.: `apply(f, parameter1, parameter2)`.")
 
         else:
-            hosh *= application.ahosh
+            self.appliable_entry = None
             appliable_function = application.appliable
 
             def f():
@@ -58,21 +62,100 @@ class Closure(AbsEntry):
                 return appliable_function(*args, **kwargs)
 
         self.f = f
-        self.hosh = hosh
+        self.args = args
         self.discarded_defaults = discarded_defaults
+        if not islazy():
+            self.hosh = self.calculate_hosh()
+
+    @property
+    def sources(self):
+        return self.args if self.appliable_entry is None else [*self.args, self.appliable_entry]
+
+    def calculate_hosh(self):
+        fhosh = self.application.ahosh if self.appliable_entry is None else self.appliable_entry.hosh.rev
+        return closure_hosh([arg.hosh for arg in self.args] + [fhosh])
+
+    @property
+    def dependencies(self):
+        if self.compacted or registry_enabled() and isregistered(self.id):
+            return ()
+        deps = [*self.fargs.values(), *self.fkwargs.values()]
+        if self.appliable_entry is not None:
+            deps.append(self.appliable_entry)
+        return deps
+
+    @property
+    def isasync(self):
+        """Whether the applied function is a coroutine function (`async def`); applied fields must be evaluated first"""
+        function = self.application.appliable if self.appliable_entry is None else self.appliable_entry.value
+        return iscoroutinefunction(function) or iscoroutinefunction(getattr(function, "__call__", None))
 
     @property
     def value(self):
-        if isinstance(self._value, Unevaluated):
-            self._value = self.f()
-            # del self.application  # todo: : delete clasure.application inside each subvalue?
-        return self._value
+        # The local variable protects the result from being evicted by other threads before returning.
+        if isinstance(result := self._value, Unevaluated):
+            self.evaluate_upstream()
+            with self.lock:
+                if isinstance(result := self._value, Unevaluated):
+                    # The registry is checked first, not to calculate a deferred identity needlessly.
+                    if not registry_enabled() or isinstance(result := recall(self.id), Unevaluated):
+                        result = self.f()
+                        if iscoroutine(result):
+                            result = await_outside_loop(result)
+                        if registry_enabled():
+                            remember(self.id, result)
+                    self._value = result
+                    tracked(self)
+        else:
+            touched(self)
+        return result
+
+    def compact(self):
+        """
+        Drop the arguments, the function and the previous versions of the hdict, keeping only id, value and repr
+
+        Long iterative loops (`d >>= apply(f, _.x).x`) can then run in constant memory.
+        A compacted closure cannot be recomputed, so it is never evicted by memory budgets.
+
+        >>> from hdict import hdict, apply, _
+        >>> d = hdict(x=3) >> apply(lambda x, y=2: x * y, _.x).z
+        >>> closure = d.raw["z"]
+        >>> closure.compact()  # Ignored while not evaluated.
+        >>> closure.fargs
+        {'x': 3}
+        >>> d.evaluate()
+        >>> closure.compact()
+        >>> closure.fargs, closure.f, closure.compacted
+        ({}, None, True)
+        >>> closure.value
+        6
+        >>> d.show(colored=False)
+        {
+            x: 3,
+            z: 6,
+            _id: oYeZrQ.z1u4mCTXllv1OuTjzk8eLHgEVcafzy4pE,
+            _ids: {
+                x: KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr,
+                z: x3j1jyLZg.MyaR-y0zBjBMWv4v3gzRL0q7-V8Q3u
+            }
+        }
+        """
+        if self.compacted or not self.isevaluated:
+            return
+        with self.lock:
+            _ = self.hosh  # Arguments and function are needed to calculate a deferred identity.
+            self.torepr = {"": self.__repr__()}
+            self.application = self.appliable_entry = self.f = None
+            self.fargs, self.fkwargs, self.args = {}, {}, []
+            self.compacted = True
 
     def __repr__(self, out=None):
         from hdict import value
         from hdict import field
         from hdict.content.entry.wrapper import Wrapper
 
+        if self.compacted:
+            return self.torepr[""]
         if out is None:
             out = []
         out = out + self.out
@@ -110,3 +193,22 @@ class Closure(AbsEntry):
                 case _:  # pragma: no cover
                     raise Exception(type(content))
         return f"λ({' '.join(lst)})"
+
+
+def await_outside_loop(coroutine):
+    """
+    Run a coroutine to completion when there is no running event loop in the current thread
+
+    >>> from hdict import hdict, apply
+    >>> async def f(x):
+    ...     return x * 2
+    >>> d = hdict(x=5) >> apply(f).y
+    >>> d.y
+    10
+    """
+    try:
+        get_running_loop()
+    except RuntimeError:
+        return run(coroutine)
+    coroutine.close()
+    raise Exception("Cannot evaluate an async function synchronously inside a running event loop.\n" "HINT: use `await d.aevaluate()` or `await d.aget('field')`.")
@@ -22,7 +22,9 @@
 #
 from dataclasses import dataclass
 
-from hdict.content.entry import AbsEntry
+from hdict.content.entry import AbsEntry, islazy
+from hdict.evaluation.budget import tracked, touched
+from hdict.evaluation.registry import recall, remember, isregistered, registry_enabled
 
 
 @dataclass
@@ -48,27 +50,55 @@ class SubValue(AbsEntry):
     # target: str = None
 
     def __post_init__(self):
-        self.hosh = self.parent.hosh[self.index, self.n]
+        if not islazy():
+            self.hosh = self.calculate_hosh()
+
+    @property
+    def sources(self):
+        return () if self.parent is None else (self.parent,)
+
+    def calculate_hosh(self):
+        return self.parent.hosh[self.index, self.n]
+
+    @property
+    def dependencies(self):
+        return () if self.compacted or registry_enabled() and isregistered(self.id) else (self.parent,)
+
+    def compact(self):
+        """Drop the parent entry of an evaluated subvalue; see `Closure.compact()`"""
+        if not self.compacted and self.isevaluated:
+            _ = self.hosh  # The parent is needed to calculate a deferred identity.
+            self.parent, self.compacted = None, True
 
     @property
     def value(self):
         from hdict.content.entry import Unevaluated
 
-        if isinstance(self._value, Unevaluated):
-            value = self.parent.value
-            if isinstance(value, (list, tuple)):
-                if len(value) < self.n:  # pragma: no cover
-                    raise Exception(f"Number of output fields ('{self.n}') should not exceed number of resulting list elements ('{len(value)}').")
-                self._value = value[self.index]
-            elif isinstance(value, dict):
-                if len(value) != self.n:  # pragma: no cover
-                    raise Exception(f"Number of output fields ('{self.n}') should match number of resulting dict entries ('{len(value)}').")
-                if self.source:
-                    self._value = value[self.source]
-                self._value = list(sorted(value.items()))[self.index][1]
-            else:  # pragma: no cover
-                raise Exception(f"Cannot infer subvalue '{self.index}' of type '{type(value).__name__} {value}.")
-        return self._value
+        if isinstance(result := self._value, Unevaluated):
+            self.evaluate_upstream()
+            with self.lock:
+                if isinstance(result := self._value, Unevaluated):
+                    if not registry_enabled() or isinstance(result := recall(self.id), Unevaluated):
+                        value = self.parent.value
+                        if isinstance(value, (list, tuple)):
+                            if len(value) < self.n:  # pragma: no cover
+                                raise Exception(f"Number of output fields ('{self.n}') should not exceed number of resulting list elements ('{len(value)}').")
+                            result = value[self.index]
+                        elif isinstance(value, dict):
+                            if len(value) != self.n:  # pragma: no cover
+                                raise Exception(f"Number of output fields ('{self.n}') should match number of resulting dict entries ('{len(value)}').")
+                            if self.source:
+                                result = value[self.source]
+                            result = list(sorted(value.items()))[self.index][1]
+                        else:  # pragma: no cover
+                            raise Exception(f"Cannot infer subvalue '{self.index}' of type '{type(value).__name__} {value}.")
+                        if registry_enabled():
+                            remember(self.id, result)
+                    self._value = result
+                    tracked(self)
+        else:
+            touched(self)
+        return result
 
     def __repr__(self):
         if self.isevaluated:
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from hdict.content.entry import AbsEntry, Unevaluated
+from hdict.content.entry import AbsEntry, Unevaluated, islazy
 
 
 @dataclass
@@ -8,13 +8,30 @@ class Wrapper(AbsEntry):
     """
     The only entry that can nest and return another entry as a value
 
-    For advanced usage only
+    For advanced usage only.
+    The nested entry is not a dependency: the applied function decides whether to evaluate it.
+
+    >>> from hdict import hdict, apply
+    >>> from hdict.content.argument.entry import entry
+    >>> calls = []
+    >>> d = hdict() >> apply(lambda: calls.append(1) or 42).x
+    >>> d >>= apply(lambda x: "skipped" if not x.isevaluated else x.value, entry("x")).y
+    >>> d.y, calls, d.raw["x"].isevaluated
+    ('skipped', [], False)
     """
 
     entry: AbsEntry
 
     def __post_init__(self):
-        self.hosh = self.entry.hosh
+        if not islazy():
+            self.hosh = self.calculate_hosh()
+
+    @property
+    def sources(self):
+        return (self.entry,)
+
+    def calculate_hosh(self):
+        return self.entry.hosh
 
     @property
     def value(self):
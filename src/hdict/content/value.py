@@ -25,6 +25,7 @@ from hosh import Hosh
 from hdict.content.argument import AbsBaseArgument
 from hdict.content.entry import AbsEntry
 from hdict.content.aux_value import v2hosh
+from hdict.content.entry import islazy
 
 
 class value(AbsBaseArgument, AbsEntry):
@@ -58,8 +59,19 @@ class value(AbsBaseArgument, AbsEntry):
         self.value = self._value = val
         if isinstance(hosh, str):
             hosh = Hosh.fromid(hosh)
-        self.hosh = v2hosh(self.value) if hosh is None else hosh
+        if hosh is not None or not islazy():
+            self.hosh = self.calculate_hosh() if hosh is None else hosh
         self.hdict = hdict
 
+    def calculate_hosh(self):
+        return v2hosh(self.value)
+
+    @staticmethod
+    def chunked(val: object, chunk_rows: int, chunk_ids: list = None):
+        """Value identified by the ids of its chunks of rows, to be cheaply extended; see `hdict.content.chunked.chunked`"""
+        from hdict.content.chunked import chunked
+
+        return chunked(val, chunk_rows, chunk_ids)
+
     def __repr__(self):
         return repr(self.value)
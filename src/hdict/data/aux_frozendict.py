@@ -24,9 +24,27 @@ class MissingFieldException(Exception):
 
 
 def handle_items(*datas: [Dict[str, object]], previous: frozenhdict):
-    result = {} if previous is None else previous.raw.copy()
-    result__mirror_fields = {}
-    for key, item in chain(*(data.items() for data in datas)):
+    from hdict.data.persistentdict import PersistentDict
+
+    # Untouched entries are shared with the previous version.
+    result = PersistentDict() if previous is None else previous.raw.derive()
+    fill_items(result, datas, previous)
+    result.seal()
+    return result
+
+
+def fill_items(result, datas, previous):
+    """Write the handled entries of `datas` into the (unsealed) `result`"""
+    from hdict.content.aux_value import v2hoshes
+    from hdict.content.entry import islazy
+
+    result__mirror_fields, metafields = {}, []
+    items = list(chain(*(data.items() for data in datas)))
+    # Large raw values are hashed concurrently beforehand.
+    hoshes = {} if islazy() else v2hoshes({i: item for i, (key, item) in enumerate(items) if isinstance(key, str) and key[0] != "_"})
+    for i, (key, item) in enumerate(items):
+        if i in hoshes:
+            item = value(item, hosh=hoshes[i])
         entry = handle_item(key, item, result, previous)
         if isinstance(key, str) and key.endswith("_") and not key.startswith("_"):
             if isinstance(entry, value):
@@ -37,10 +55,17 @@ def handle_items(*datas: [Dict[str, object]], previous: frozenhdict):
                 raise Exception(f"lazy mirror?")  # todo:
         if isinstance(entry, dict):
             result.update(entry)
+            metafields.extend(k for k in entry if k[-1] == "_" and k[0] == "_")
         else:
             result[key] = entry
+            if isinstance(key, str) and key[-1] == "_" and key[0] == "_":
+                metafields.append(key)
     result.update(result__mirror_fields)
-    return result
+    for k in metafields:
+        # Metafields, e.g.: `_myfield_`, do not take part in the identity.
+        if len(k) < 3:
+            raise Exception(f"Cannot have a field named `__`.")
+        result[k] = value(result[k].value, hosh=ø)
 
 
 def handle_item(key, item, result, previous):
@@ -64,6 +89,8 @@ def handle_item(key, item, result, previous):
         case sample():  # pragma: no cover
             raise Exception(f"Unsampled variable or argument `{key}`")
         case frozenhdict():
+            # An hdict being changed by `hdict.batch()` is taken as it is now.
+            item = item.snapshot()
             res = value(item, item.hosh)
         case hdict():
             res = value(item.frozen, item.hosh)
@@ -95,7 +122,7 @@ def handle_item(key, item, result, previous):
     return res
 
 
-def handle_identity(data):
+def handle_identity(data, previous=None):
     """
     >>> from hdict import _
     >>> d = hdict(_x_=5)
@@ -153,34 +180,56 @@ def handle_identity(data):
             _y_: 0000000000000000000000000000000000000000
         }
     }
+
+    Given the previous version of the hdict, only the contributions of new or replaced entries are (re)computed.
+
+    >>> from pandas import DataFrame
+    >>> d = hdict(x=1, df_=DataFrame({"a": [1, 2]}), _w_=3)
+    >>> e = d >> {"x": 5, "k": 7}
+    >>> e.hosh == frozenhdict(e.raw).hosh, list(e.ids) == list(frozenhdict(e.raw).ids)
+    (True, True)
+    >>> list(e.ids)
+    ['x', 'df', 'k', 'df_', '_w_']
     """
-    hosh = ø
-    ids, later, later2 = {}, {}, {}
-    for k, v in data.items():
-        # Handle meta,mirror field ids differently.
-        if k[-1] == "_":
-            if k[0] == "_":
-                if len(k) < 3:
-                    raise Exception(f"Cannot have a field named `__`.")
-                v = value(v.value, hosh=ø)  # metafield, e.g.: `_myfield_`
-                data[k] = v
-                khosh = ø
-                later2[k] = v.id
-            else:
-                khosh = k.encode()  # mirror field, e.g.: `df_` is a mirror/derived from `df`
-                later[k] = v.id
+    from hdict.data.persistentdict import PersistentDict
+
+    # REMINDER: `data` is derived from `previous.raw` by `handle_items()`.
+    if previous is None or previous._contributions is None:
+        hosh, ids, contributions, changed = ø, PersistentDict(), PersistentDict(), data.items()
+    else:
+        # Only the entries written on top of the previous version.
+        hosh, ids, contributions = previous.hosh, previous._ids.derive(), previous._contributions.derive()
+        changed = data.changes.items()
+    sort = False
+    for k, v in changed:
+        if k in contributions:
+            hosh -= contributions[k]
+        # Handle meta,mirror field ids differently. Metafields are already normalized by `handle_items()`.
+        if k[-1] == "_" and k[0] == "_":
+            khosh = ø  # metafield, e.g.: `_myfield_`
         else:
-            ids[k] = v.hosh.id
-            khosh = k.encode()
-        hosh += v.hosh * khosh
+            khosh = k.encode()  # mirror fields, e.g.: `df_` is a mirror/derived from `df`, are also identified by name
+        # Ids of regular fields come first, then mirror fields, then metafields.
+        if k not in ids and ids and _idgroup(k) < _idgroup(next(reversed(ids))):
+            sort = True
+        ids[k] = v.hosh.id
+        contributions[k] = contribution = v.hosh * khosh
+        hosh += contribution
         # todo:  PAPER REMINDER: state in the paper that identifiers are not strings. they are a special type that never appears as a value.
         #   I.e., hash(identifier) must be different from hash(value), for all identifiers and values.
         #   E.g.: hash(field name X) != hash(string "X")
         #   In this impementation, the difference is always* true because values are always pickled (they are never hashed as strings), while identifiers are just str.encoded().
         #   * → probabilistically
-    ids.update(later)
-    ids.update(later2)
-    return hosh, ids
+    if sort:
+        ids = PersistentDict(sorted(ids.items(), key=lambda item: _idgroup(item[0])))
+    ids.seal()
+    contributions.seal()
+    return hosh, ids, contributions
+
+
+def _idgroup(k):
+    """0: regular field; 1: mirror field; 2: metafield"""
+    return (k[-1] == "_") + (k[0] == "_" and k[-1] == "_")
 
 
 def handle_multioutput(field_names: tuple, entry: AbsEntry | apply, previous_result, previous):
@@ -26,6 +26,7 @@ import re
 from collections import UserDict
 from io import StringIO
 from typing import TypeVar, Union
+from weakref import ref
 
 from hdict.dataset.dataset import loads, isplit
 from hdict.dataset.pandas_handling import file2df
@@ -126,21 +127,125 @@ class frozenhdict(UserDict, dict[str, VT]):
     _evaluated = None
     _asdict, _asdicts, _asdicts_noid = None, None, None
     _hoshes = None
+    _hosh, _ids, _previous = None, None, None
+    _idsdict = None  # Plain dict version of `_ids`, materialized on request.
+    _base = None  # Version a frozenhdict under construction by `hdict.batch()` derives from.
+    _contributions = None  # field -> its term in the sum that gives `hosh`
 
     # noinspection PyMissingConstructor
     def __init__(self, /, _dictionary=None, _previous=None, **kwargs):
         from hdict.content.entry import AbsEntry
         from hdict.data.aux_frozendict import handle_identity
         from hdict.data.aux_frozendict import handle_items
+        from hdict.content.entry import islazy
 
         # todo: : check if _dictionary keys is 'str'; regex to check if k is an identifier;
         data = _dictionary or {}
         # REMINDER: Inside data, the only 'dict' entries are "_id" and "_ids", the rest are AbsEntry objects.
         self.data: dict[str, AbsEntry | str | dict[str, str]]
         self.data = handle_items(data, kwargs, previous=_previous)
-        self.hosh, self.ids = handle_identity(self.data)
-        self.id = self.hosh.id
         self.raw = self.data
+        if islazy():
+            # Only a weak reference, to not keep all versions alive until the identity is requested.
+            # An unsealed previous version (inside `hdict.batch()`) may still change, so it cannot be relied upon.
+            self._previous = None if _previous is None or not _previous.raw.sealed else ref(_previous)
+        else:
+            self._hosh, self._ids, self._contributions = handle_identity(self.data, _previous)
+
+    @property
+    def hosh(self):
+        if self._hosh is None:
+            from hdict.data.aux_frozendict import handle_identity
+
+            previous = None if self._previous is None else self._previous()
+            self._hosh, self._ids, self._contributions = handle_identity(self.data, previous)
+            self._previous = None
+            if self.raw.sealed:
+                self._base = None  # Only needed to calculate the identity.
+        return self._hosh
+
+    def derived(self):
+        """
+        Unsealed copy to be filled in place by `hdict.batch()`; it shares the entries of this one
+
+        Its identity is calculated when requested or when it is `seal()`ed, considering only what was written.
+        """
+        new = frozenhdict.__new__(frozenhdict)
+        new.data = new.raw = self.raw.derive()
+        new._base = self
+        new._reset()
+        return new
+
+    def snapshot(self):
+        """
+        Sealed frozenhdict with the current content of a `derived()` one, which keeps accumulating changes on top of it
+
+        A sealed frozenhdict is returned as is.
+        """
+        if self.raw.sealed:
+            return self
+        if not self.data.changes and self._base is not None:
+            return self._base  # Nothing was written since the last snapshot.
+        new = frozenhdict.__new__(frozenhdict)
+        new.data = new.raw = self.data.snapshot()
+        new._base = self._base
+        new._reset()
+        self._base = new
+        self._reset()
+        return new
+
+    def _reset(self):
+        """Discard identity and representations after an in-place change"""
+        self._hosh = self._ids = self._idsdict = self._contributions = self._hoshes = self._evaluated = None
+        self._asdict = self._asdicts = self._asdicts_noid = None
+        self._previous = None if self._base is None else ref(self._base)
+
+    def write(self, dct: dict, previous):
+        """Add entries in place, `previous` being the hdict `_` refers to; only while not sealed"""
+        from hdict.data.aux_frozendict import fill_items
+
+        fill_items(self.data, (dct,), previous)
+        self._reset()
+
+    def remove(self, key):
+        """Remove an entry in place; only while not sealed"""
+        from hdict.data.persistentdict import PersistentDict
+
+        content = self.data.copy()
+        del content[key]
+        # There is nothing to share anymore: the identity will be calculated from scratch.
+        self.data = self.raw = PersistentDict(content)
+        self._base = None
+        self._reset()
+
+    def seal(self):
+        """Finish the construction of a `derived()` frozenhdict"""
+        from hdict.content.entry import islazy
+
+        self.data.seal()
+        if not islazy():
+            _ = self.hosh
+
+    @property
+    def ids(self):
+        """
+        Ids of the fields, as a plain dict
+
+        >>> import json
+        >>> d = frozenhdict(x=3) >> {"y": 2}
+        >>> json.dumps(d.ids), isinstance(d.ids, dict), d.ids | {"z": "-"}
+        ('{"x": "KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr", "y": "k3PWYRxIEc0lEvD1f6rbnk.36RAD5AyfROy1aT29"}', True, {'x': 'KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr', 'y': 'k3PWYRxIEc0lEvD1f6rbnk.36RAD5AyfROy1aT29', 'z': '-'})
+        """
+        if self._idsdict is None:
+            if self._ids is None:
+                _ = self.hosh
+            # `_ids` shares its content with other versions; the dict is built once, since it does not change.
+            self._idsdict = self._ids.copy()
+        return self._idsdict
+
+    @property
+    def id(self):
+        return self.hosh.id
 
     @property
     def hoshes(self):
@@ -244,9 +349,12 @@ class frozenhdict(UserDict, dict[str, VT]):
             }
         }
         """
+        from hdict.content.aux_value import v2hoshes
         from hdict.content.value import value
-        from hdict.content.entry import AbsEntry
+        from hdict.content.entry import AbsEntry, islazy
 
+        # Large values without a provided id are hashed concurrently.
+        hoshes = {} if islazy() else v2hoshes({k: v for k, v in dictionary.items() if k not in ids})
         data = {}
         for k, v in dictionary.items():
             if isinstance(v, AbsEntry):
@@ -254,20 +362,159 @@ class frozenhdict(UserDict, dict[str, VT]):
                     raise Exception(f"Conflicting ids provided for key '{k}': ival.id={v.id}; ids[{k}]={ids[k]}")
                 data[k] = v
             else:
-                data[k] = value(v, ids[k] if k in ids else None)
+                data[k] = value(v, ids[k] if k in ids else hoshes.get(k))
         return frozenhdict(data)
 
     @property
     def evaluated(self):
         if self._evaluated is None:
-            for k, val in self.data.items():
-                val.evaluate()
-            self._evaluated = self
-        return self
+            self.evaluate()
+        return self.snapshot()
+
+    def plan(self, fields=None):
+        """
+        Dependency graph of the given fields (default: all), telling what is evaluated, cached or yet to compute
+
+        >>> from hdict import frozenhdict, apply
+        >>> d = frozenhdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda x: x * 2).z
+        >>> d.plan(["y"])
+        Plan(fields=['y'], evaluated=['x'], cached=[], tocompute=['y'])
+        """
+        from hdict.evaluation.plan import Plan
+
+        return Plan(self.data, fields)
+
+    def evaluate(self, executor=None, max_workers=None, fields=None, free=False, max_bytes=None):
+        """
+        Evaluate all fields, or only the given `fields` and what they depend on
+
+        With `free=True`, each intermediate value is dropped as soon as its last consumer is evaluated,
+        so only the requested fields stay in memory. Dropped entries are recomputed (or refetched) if needed later.
+        `max_bytes` limits the memory held by the values evaluated here, dropping the least recently evaluated ones.
+        See `hdict.evaluation.budget.set_memory_budget()` for a process-wide limit.
 
-    def evaluate(self):
+        Independent closures can run concurrently by setting `executor="threads"`.
+        This helps when the applied functions release the GIL (e.g., NumPy, scikit-learn).
+        Pure-Python CPU-bound functions should use `executor="processes"` instead (needs the 'fork' start method).
+
+        >>> from hdict import frozenhdict, apply
+        >>> d = frozenhdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda x: x * 2).z
+        >>> d.evaluate(executor="threads", max_workers=2)
+        >>> d.show(colored=False)
+        {
+            x: 3,
+            y: 4,
+            z: 6,
+            _id: zB4K9ZLtMU3DA9lL5VIbXMsYpHVUzZJVIpxKqP-t,
+            _ids: {
+                x: KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr,
+                y: KeU-dCTjUgnSYGRNrrMMr4i.hg64Dkkfb3c14eh3,
+                z: yVxDxDr.VRUVy4q7JRPmlXrKonDwwEfALZe3jitf
+            }
+        }
+        >>> d = frozenhdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda x: x * 2).z
+        >>> d.evaluate(executor="processes")
+        >>> d.y, d.z
+        (4, 6)
+        >>> d = frozenhdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda x: x * 2).z
+        >>> d.evaluate(fields=["y"])
+        >>> d.raw["y"].isevaluated, d.raw["z"].isevaluated
+        (True, False)
+        >>> d = frozenhdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda y: y * 2).z >> apply(lambda z: -z).w
+        >>> d.evaluate(fields=["w"], free=True)
+        >>> [d.raw[k].isevaluated for k in "xyzw"]
+        [True, False, False, True]
+        >>> import numpy as np
+        >>> d = frozenhdict(n=1000) >> apply(lambda n: np.ones(n)).a >> apply(lambda a: a * 2).b >> apply(lambda b: b * 2).c
+        >>> d.evaluate(max_bytes=20000)
+        >>> [d.raw[k].isevaluated for k in "abc"]
+        [False, True, True]
+        >>> int(d.a.sum())
+        1000
+        """
         # todo: add flag to inhibit evaluation (i.e., fetching) of cached values; or other solution, e.g. Cache(write_onapply)
-        _ = self.evaluated
+        from hdict.evaluation.executor import evaluate
+
+        if fields is not None:
+            # A `Plan` would also classify every node; see `plan()`.
+            if missing := [field for field in fields if field not in self.data]:
+                raise Exception(f"Cannot evaluate missing fields: {missing}")
+            evaluate([self.data[field] for field in fields], executor, max_workers, free, max_bytes)
+            return
+        evaluate(self.data.values(), executor, max_workers, free, max_bytes)
+        if max_bytes is None:
+            self._evaluated = self
+
+    def compact(self):
+        """
+        Release what evaluated fields hold only to be (re)computed: arguments, functions and previous versions of the hdict
+
+        Unevaluated fields are kept intact. See `Closure.compact()`.
+
+        >>> import gc, weakref
+        >>> from hdict import frozenhdict, apply, _
+        >>> d = frozenhdict(x=0)
+        >>> first = weakref.ref(d)
+        >>> for i in range(3):
+        ...     d >>= apply(lambda x, _: x + 1, _.x, _).x
+        ...     d.evaluate()
+        ...     d.compact()
+        >>> _ = gc.collect()
+        >>> d.x, first()
+        (3, None)
+        """
+        for entry in self.data.values():
+            entry.compact()
+
+    async def aevaluate(self, max_workers=None):
+        """
+        Evaluate all fields inside the running event loop
+
+        Applied `async def` functions run concurrently in the event loop; the remaining ones run in a thread pool.
+
+        >>> import asyncio
+        >>> from hdict import frozenhdict, apply
+        >>> async def load(x):
+        ...     await asyncio.sleep(0)
+        ...     return x * 2
+        >>> d = frozenhdict(x=3) >> apply(load).y >> apply(lambda y: y + 1).z
+        >>> asyncio.run(d.aevaluate())
+        >>> d.show(colored=False)
+        {
+            x: 3,
+            y: 6,
+            z: 7,
+            _id: 9BKtS91ahRCjwR3SGqRi.UJ47lSO9y.y8LbrC5qG,
+            _ids: {
+                x: KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr,
+                y: UH0Oy1E1xPH1nlGt3I.rSvznS6jwUNj7V-PAeIEY,
+                z: TtNtVrg0waxIeh-ElwndmkkJlN6NKSxltPMbk6xy
+            }
+        }
+        """
+        from hdict.evaluation.executor import aevaluate
+
+        await aevaluate(self.data.values(), max_workers)
+        self._evaluated = self
+
+    async def aget(self, field):
+        """
+        Evaluate a single field (and its dependencies) inside the running event loop
+
+        >>> import asyncio
+        >>> from hdict import frozenhdict, apply
+        >>> async def load(x):
+        ...     await asyncio.sleep(0)
+        ...     return x * 2
+        >>> d = frozenhdict(x=3) >> apply(load).y >> apply(lambda y: y + 1).z
+        >>> asyncio.run(d.aget("z"))
+        7
+        """
+        from hdict.evaluation.executor import aevaluate
+
+        entry = self.data[field]
+        await aevaluate([entry])
+        return entry.value
 
     @property
     def asdict(self):
@@ -396,7 +643,7 @@ class frozenhdict(UserDict, dict[str, VT]):
     def unfrozen(self):
         from hdict import hdict
 
-        return hdict(_frozen=self)
+        return hdict(_frozen=self.snapshot())
 
     # def entries(self, evaluate=True):
     #     """Iterator over all items"""
@@ -426,7 +673,7 @@ class frozenhdict(UserDict, dict[str, VT]):
         """
         Store an entire frozenidict
         """
-        from hdict.persistence.stored import Stored
+        from hdict.persistence.stored import stored
 
         data = {self.id: self.ids}
         for field, fid in self.ids.items():
@@ -438,7 +685,7 @@ class frozenhdict(UserDict, dict[str, VT]):
             elif isinstance(value, frozenhdict):
                 value.save(storage)
             else:
-                data[fid] = Stored(value)
+                data[fid] = stored(value, storage)
         # todo:  check if frozenhdict is being stored by mistake
         # todo:  attribute/method as subfield:
         #       apply(f, _.df.x)            SubField(name="df", attribute="x")
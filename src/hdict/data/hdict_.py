@@ -20,6 +20,7 @@
 #  part of this work is illegal and it is unethical regarding the effort and
 #  time spent here.
 #
+from contextlib import contextmanager
 from typing import TypeVar, Union
 
 from hosh import Hosh
@@ -114,30 +115,125 @@ class hdict_(dict[str, VT]):
     }
     """
 
+    _batch = None  # State before the current `batch()`, if any.
+
     # noinspection PyMissingConstructor
     def __init__(self, /, _dictionary: dict = None, _frozen: frozenhdict = None, **kwargs):
         # Build hdict from frozen or fresh data. Never both.
-        self.frozen = _frozen or frozenhdict(_dictionary, **kwargs)
-        self.raw = self.frozen.data
+        self._frozen = _frozen or frozenhdict(_dictionary, **kwargs)
+        self.raw = self._frozen.data
+
+    @property
+    def frozen(self):
+        """Immutable version of this hdict; inside `batch()`, a snapshot of the pending state"""
+        return self._frozen if self._batch is None else self._frozen.snapshot()
+
+    @frozen.setter
+    def frozen(self, frozen):
+        self._frozen = frozen
 
     def __setitem__(self, key: str | tuple, value):
         if isinstance(key, tuple):
             key = tuple((x.start, x.stop) if isinstance(x, slice) else x for x in key)
-        self.frozen = self.frozen >> {key: value}
-        self.raw = self.frozen.data
+        if self._batch is None:
+            self._frozen = self._frozen >> {key: value}
+        else:
+            self._frozen.write({key: value}, self._frozen)
+        self.raw = self._frozen.data
 
     def __delitem__(self, key):
-        data = self.frozen.data.copy()
-        del data[key]
-        self.frozen = frozenhdict(data)
-        self.raw = self.frozen.data
+        if self._batch is None:
+            data = self._frozen.data.copy()
+            del data[key]
+            self._frozen = frozenhdict(data)
+        else:
+            self._frozen.remove(key)
+        self.raw = self._frozen.data
+
+    @contextmanager
+    def batch(self):
+        """
+        Accumulate assignments, deletions and inplace applications, producing a single new frozen state at the end
+
+        Reads inside the block see the pending changes; so does `_`, as it would without a batch.
+        `d.frozen`, `d.evaluated` and hdicts derived inside the block are snapshots, not affected by later changes.
+        If an exception is raised, all pending changes are discarded.
+
+        >>> from hdict import hdict, apply
+        >>> d = hdict(x=1)
+        >>> with d.batch():
+        ...     for i in range(3):
+        ...         d[f"v{i}"] = i
+        ...     d.apply(lambda x, v2: x + v2, out="y")
+        ...     del d["v0"]
+        ...     d.y
+        3
+        >>> d == hdict(x=1, v1=1, v2=2) >> apply(lambda x, v2: x + v2).y
+        True
+        >>> try:
+        ...     with d.batch():
+        ...         d["z"] = 5
+        ...         raise Exception("Aborted")
+        ... except Exception:
+        ...     pass
+        >>> "z" in d
+        False
+
+        >>> from hdict import _
+        >>> with d.batch():
+        ...     d["z"] = 5
+        ...     e, f = d >> {"w": 6}, d.frozen
+        ...     d["z"] = 50
+        ...     d["w"] = apply(lambda d: d.z, _)
+        >>> e.z, e.w, f.z, "w" in f, d.z, d.w
+        (5, 6, 5, False, 50, 50)
+
+        Ids are the same as for the same operations without a batch.
+        >>> from random import Random
+        >>> rnd, a, b = Random(0), hdict(x=0), hdict(x=0)
+        >>> ops = [rnd.choice("=_a-") for _ in range(300)]
+        >>> def run(d, op, i):
+        ...     keys = [k for k in d.keys() if k != "x"]
+        ...     if op == "-" and keys:
+        ...         del d[rnd.choice(keys)]
+        ...     elif op == "_":
+        ...         d[f"k{i % 20}"] = apply(lambda d: len(d), _)
+        ...     elif op == "a":
+        ...         d.apply(lambda x: x + 1, out=f"k{i % 20}")
+        ...     else:
+        ...         d[f"k{i % 20}"] = i
+        >>> rnd.seed(1)
+        >>> for i, op in enumerate(ops):
+        ...     run(a, op, i)
+        >>> rnd.seed(1)
+        >>> with b.batch():
+        ...     for i, op in enumerate(ops):
+        ...         run(b, op, i)
+        >>> a == b, a.ids == b.ids, a.evaluated.asdict == b.evaluated.asdict
+        (True, True, True)
+        """
+        if self._batch is not None:  # Nested batches join the outer one.
+            yield self
+            return
+        self._batch = before = self._frozen
+        self._frozen = before.derived()
+        self.raw = self._frozen.data
+        try:
+            yield self
+            self._frozen.seal()
+        except BaseException:
+            self._frozen = before
+            raise
+        finally:
+            self._batch = None
+            self.raw = self._frozen.data
 
     def __getitem__(self, item):
-        return self.frozen[item]
+        return self._frozen[item]
 
     def __getattr__(self, item):
-        if item in self.frozen:
-            return self.frozen[item]
+        if item in self._frozen:
+            return self._frozen[item]
         return self.__getattribute__(item)  # pragma: no cover
 
     def __rmul__(self, other):
@@ -156,8 +252,14 @@ class hdict_(dict[str, VT]):
     def evaluated(self):
         return self.frozen.evaluated
 
-    def evaluate(self):
+    def plan(self, fields=None):
+        """Dependency graph of the given fields (default: all); see `frozenhdict.plan()`"""
+        return self._frozen.plan(fields)
+
+    def evaluate(self, executor=None, max_workers=None, fields=None, free=False, max_bytes=None):
         """
+        Evaluate all fields, or only `fields`; see `frozenhdict.evaluate()` for concurrent evaluation
+
         >>> from hdict import apply, hdict
         >>> d = hdict(x=apply(apply(lambda: 2)))
         >>> d.show(colored=False)
@@ -185,12 +287,50 @@ class hdict_(dict[str, VT]):
                 x: J746LLRT3gd5glC2ZiaHBgHegmewpiOMC4Sq4bp9
             }
         }
+        >>> d = hdict(x=3) >> apply(lambda x: x + 1).y >> apply(lambda x: x * 2).z
+        >>> d.evaluate(executor="threads")
+        >>> d.y, d.z
+        (4, 6)
+        """
+        self._frozen.evaluate(executor, max_workers, fields, free, max_bytes)
+
+    def compact(self):
+        """Release what evaluated fields hold only to be (re)computed; see `frozenhdict.compact()`"""
+        self._frozen.compact()
+
+    async def aevaluate(self, max_workers=None):
+        """
+        Evaluate all fields inside the running event loop; see `frozenhdict.aevaluate()`
+
+        >>> import asyncio
+        >>> from hdict import apply, hdict
+        >>> async def load(x):
+        ...     await asyncio.sleep(0)
+        ...     return x * 2
+        >>> d = hdict(x=3) >> apply(load).y
+        >>> asyncio.run(d.aevaluate())
+        >>> d.y
+        6
+        """
+        await self._frozen.aevaluate(max_workers)
+
+    async def aget(self, field):
+        """
+        Evaluate a single field inside the running event loop; see `frozenhdict.aget()`
+
+        >>> import asyncio
+        >>> from hdict import apply, hdict
+        >>> async def load(x):
+        ...     return x * 2
+        >>> d = hdict(x=3) >> apply(load).y
+        >>> asyncio.run(d.aget("y"))
+        6
         """
-        self.frozen.evaluate()
+        return await self._frozen.aget(field)
 
     @property
     def hosh(self):
-        return self.frozen.hosh
+        return self._frozen.hosh
 
     @property
     def id(self):
@@ -208,7 +348,7 @@ class hdict_(dict[str, VT]):
         >>> hdict(x=3, y=5).ids
         {'x': 'KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr', 'y': 'ecvgo-CBPi7wRWIxNzuo1HgHQCbdvR058xi6zmr2'}
         """
-        return self.frozen.ids
+        return self._frozen.ids
 
     @staticmethod
     def fromdict(dictionary, ids):
@@ -246,7 +386,7 @@ class hdict_(dict[str, VT]):
         >>> hdict(x=3, y=5).asdict
         {'x': 3, 'y': 5, '_id': 'r5A2Mh6vRRO5rxi5nfXv1myeguGSTmqHuHev38qM', '_ids': {'x': 'KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr', 'y': 'ecvgo-CBPi7wRWIxNzuo1HgHQCbdvR058xi6zmr2'}}
         """
-        return self.frozen.asdict
+        return self._frozen.asdict
 
     @property
     def asdicts(self):
@@ -255,11 +395,11 @@ class hdict_(dict[str, VT]):
         >>> hdict(x=3, y=5).asdict
         {'x': 3, 'y': 5, '_id': 'r5A2Mh6vRRO5rxi5nfXv1myeguGSTmqHuHev38qM', '_ids': {'x': 'KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr', 'y': 'ecvgo-CBPi7wRWIxNzuo1HgHQCbdvR058xi6zmr2'}}
         """
-        return self.frozen.asdicts
+        return self._frozen.asdicts
 
     @property
     def asdicts_noid(self):
-        return self.frozen.asdicts_noid
+        return self._frozen.asdicts_noid
 
     def astext(self, colored=True, key_quotes=False):
         r"""
@@ -277,7 +417,7 @@ class hdict_(dict[str, VT]):
             }
         }
         """
-        return self.frozen.astext(colored, key_quotes)
+        return self._frozen.astext(colored, key_quotes)
 
     def show(self, colored=True, key_quotes=False):
         r"""
@@ -296,33 +436,33 @@ class hdict_(dict[str, VT]):
             }
         }
         """
-        return self.frozen.show(colored, key_quotes)
+        return self._frozen.show(colored, key_quotes)
 
     def __iter__(self):
-        return iter(self.frozen)
+        return iter(self._frozen)
 
     def __contains__(self, item):
-        return item in self.frozen
+        return item in self._frozen
 
     def __repr__(self):
-        return repr(self.frozen)
+        return repr(self._frozen)
 
     def __str__(self):
-        return str(self.frozen)
+        return str(self._frozen)
 
     def __eq__(self, other):
-        return self.frozen == other
+        return self._frozen == other
 
     def __ne__(self, other):
-        return self.frozen != other
+        return self._frozen != other
 
     def keys(self):
         """Generator of field names, i.e., keys which don't start with '_'"""
-        return self.frozen.keys()
+        return self._frozen.keys()
 
     def values(self, evaluate=True):
         """Generator of field values (keys that don't start with '_')"""
-        return self.frozen.values(evaluate)
+        return self._frozen.values(evaluate)
 
     def items(self, evaluate=True):
         """Generator over field-value pairs
@@ -335,7 +475,7 @@ class hdict_(dict[str, VT]):
         x 1
         y 2
         """
-        return self.frozen.items(evaluate)
+        return self._frozen.items(evaluate)
 
     def __hash__(self):  # pragma: no cover
         raise Exception(f"hdict is not hashable. Please use hdict.frozen instead.")
@@ -407,7 +547,7 @@ class hdict_(dict[str, VT]):
             }
         }
         """
-        self.frozen.save(storage)
+        self._frozen.save(storage)
 
     @staticmethod
     def fetch(id: str, storage: dict, lazy=True) -> Union["hdict_", None]:
@@ -639,7 +779,7 @@ class hdict_(dict[str, VT]):
         b  2  6
         c  3  7
         """
-        return self.frozen.asdf
+        return self._frozen.asdf
 
     @property
     def hoshes(self):
@@ -648,22 +788,26 @@ class hdict_(dict[str, VT]):
         >>> [h.id for h in frozenhdict(x=3, y=2).hoshes.values()]
         ['KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr', 'k3PWYRxIEc0lEvD1f6rbnk.36RAD5AyfROy1aT29']
         """
-        return self.frozen.hoshes
+        return self._frozen.hoshes
 
     def __bool__(self):
-        return bool(self.frozen.data)
+        return bool(self._frozen.data)
 
     def apply(self, appliable: apply | field, *applied_args, out=None, fhosh: Hosh = None, inplace=True, _sampleable=None, **applied_kwargs):
         if out is None:
             raise Exception(f"Missing output field name `out`")
         a = apply(appliable, *applied_args, fhosh=fhosh, _sampleable=_sampleable, **applied_kwargs)
         ao = a(*out) if isinstance(out, tuple) else a(out)
+        if inplace and self._batch is not None:
+            self._frozen.write({ao.out: ao.nested}, self._frozen)
+            self.raw = self._frozen.data
+            return
         frozen = self.frozen >> ao
         if inplace:
-            self.frozen = frozen
-            self.raw = self.frozen.data
+            self._frozen = frozen
+            self.raw = self._frozen.data
         else:
             return frozen.unfrozen
 
     # def __reduce__(self):
-    # return self.frozen.__reduce__()
+    # return self._frozen.__reduce__()
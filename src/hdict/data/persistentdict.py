@@ -0,0 +1,150 @@
+from collections.abc import Mapping
+
+
+class PersistentDict(Mapping):
+    """
+    Insertion-ordered mapping that shares its content with the mapping it was derived from
+
+    The content is a stack of dicts (layers); upper layers hold new or replaced items.
+    Each derived mapping writes only to its own new layer, so untouched items are shared among all versions.
+    When `seal()`ed, a layer is merged with the one below it while they have comparable sizes,
+    keeping O(log n) layers and an amortized cost per written item of O(log n).
+
+    >>> a = PersistentDict({"x": 1, "y": 2})
+    >>> b = a.derive()
+    >>> b["y"], b["z"] = 20, 3
+    >>> b.seal()
+    >>> a, b, len(b), b.changes
+    ({'x': 1, 'y': 2}, {'x': 1, 'y': 20, 'z': 3}, 3, {'y': 20, 'z': 3})
+    >>> list(reversed(b)), b == {"x": 1, "y": 20, "z": 3}
+    (['z', 'y', 'x'], True)
+    >>> b | {"w": 0}, type(b | {})
+    ({'x': 1, 'y': 20, 'z': 3, 'w': 0}, <class 'dict'>)
+    >>> c = b.derive()
+    >>> c["w"] = 4
+    >>> c.seal()
+    >>> len(c.layers), c.layers[0] is b.layers[0]
+    (2, True)
+    >>> d = c.derive()
+    >>> d["v"] = 5
+    >>> e = d.derive()  # Deriving from an unsealed mapping takes a snapshot of its pending layer.
+    >>> d["v"], d["u"] = 50, 6
+    >>> e, len(e)
+    ({'x': 1, 'y': 20, 'z': 3, 'w': 4, 'v': 5}, 5)
+    >>> b["k"] = 0  # doctest:+ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    Exception: Cannot change a sealed PersistentDict...
+    """
+
+    __slots__ = ("layers", "changes", "size", "sealed")
+
+    def __init__(self, dictionary=None):
+        self.layers = [{} if dictionary is None else dict(dictionary)]
+        self.changes = self.layers[0]
+        self.size = len(self.layers[0])
+        self.sealed = False
+
+    def derive(self):
+        """New mapping with the same content and an own empty layer to write to"""
+        new = PersistentDict.__new__(PersistentDict)
+        if self.sealed:
+            new.layers = [*self.layers, {}]
+        else:  # The top layer can still change, so it is not shared.
+            new.layers = [*self.layers[:-1], self.layers[-1].copy(), {}]
+        new.changes = new.layers[-1]
+        new.size, new.sealed = self.size, False
+        return new
+
+    def snapshot(self):
+        """
+        Sealed mapping with the current content; further changes to this one go to a new layer on top of it
+
+        >>> a = PersistentDict({"x": 1})
+        >>> b = a.snapshot()
+        >>> a["x"], a["y"] = 10, 2
+        >>> b, a, a.changes, b.layers[0] is a.layers[0]
+        ({'x': 1}, {'x': 10, 'y': 2}, {'x': 10, 'y': 2}, True)
+        """
+        new = PersistentDict.__new__(PersistentDict)
+        new.layers, new.changes, new.size, new.sealed = list(self.layers), self.changes, self.size, False
+        new.seal()
+        self.layers = [*new.layers, {}]
+        self.changes = self.layers[-1]
+        return new
+
+    def seal(self):
+        """Forbid changes, and merge layers of comparable sizes"""
+        layers = self.layers
+        if len(layers) > 1 and not layers[-1]:
+            layers.pop()
+        while len(layers) > 1 and 2 * len(layers[-1]) >= len(layers[-2]):
+            merged = layers[-2].copy()
+            merged.update(layers.pop())
+            layers[-1] = merged
+        self.sealed = True
+
+    def __setitem__(self, key, value):
+        if self.sealed:
+            raise Exception(f"Cannot change a sealed PersistentDict: '{key}'.")
+        if key not in self:
+            self.size += 1
+        self.changes[key] = value
+
+    def update(self, other=(), /, **kwargs):
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        for layer in reversed(self.layers):
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self.layers)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        layers = self.layers
+        if len(layers) == 1:
+            yield from layers[0]
+            return
+        # Keys keep the position of their first insertion.
+        for i, layer in enumerate(layers):
+            for key in layer:
+                if not any(key in lower for lower in layers[:i]):
+                    yield key
+
+    def __reversed__(self):
+        layers = self.layers
+        for i in range(len(layers) - 1, -1, -1):
+            for key in reversed(layers[i]):
+                if not any(key in lower for lower in layers[:i]):
+                    yield key
+
+    def copy(self):
+        """Plain `dict` with the same content"""
+        return {key: self[key] for key in self}
+
+    def __or__(self, other):
+        """Plain `dict` with the content of both, as `dict | dict`"""
+        return self.copy() | dict(other)
+
+    def __ror__(self, other):
+        return dict(other) | self.copy()
+
+    def __reduce__(self):
+        return sealed, (self.copy(),)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+def sealed(dictionary):
+    """Sealed `PersistentDict` with the given content"""
+    new = PersistentDict(dictionary)
+    new.seal()
+    return new
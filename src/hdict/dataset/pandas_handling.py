@@ -88,15 +88,44 @@ def explode_df(df):
         }
     }
     """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from hdict.content.aux_value import v2hosh, hashing_workers, STREAMING_THRESHOLD
+    from hdict.content.value import value
     from hdict.data.frozenhdict import frozenhdict
 
-    dic = {"index": df.index.to_series()}
+    dic = {"index": index2series(df.index)}
     for col in df:
         dic[str(col)] = df[col]
+    # Large columns are hashed in parallel: the streaming hasher releases the GIL while digesting their buffers.
+    workers = hashing_workers(len(dic))
+    if workers > 1 and sum(series.nbytes for series in dic.values()) >= STREAMING_THRESHOLD:
+        with ThreadPoolExecutor(workers) as pool:
+            hoshes = list(pool.map(v2hosh, dic.values()))
+        dic = {k: value(v, hosh=h) for (k, v), h in zip(dic.items(), hoshes)}
     d = frozenhdict(dic)
     return d
 
 
+def index2series(index):
+    """
+    Same as `index.to_series()`, also when pickled, but without copying the index values when they are a NumPy array
+
+    >>> from pickle import dumps
+    >>> from pandas import Index
+    >>> index = Index([10, 20, 30], name="i")
+    >>> dumps(index2series(index), protocol=5) == dumps(index.to_series(), protocol=5)
+    True
+    """
+    from numpy import ndarray
+    from pandas import Series
+
+    values = index._values
+    # A distinct array object is needed, otherwise pickle would serialize it as a reference to the index data.
+    values = values.view() if isinstance(values, ndarray) else values.copy()
+    return Series(values, index=index.view(), name=index.name, copy=False)
+
+
 def file2df(filename, hide_types=True, return_name=True, transpose=False, index=False):
     from hdict.dataset.dataset import load
 
@@ -0,0 +1,129 @@
+import sys
+from collections import OrderedDict
+from threading import RLock
+from weakref import ref
+
+from hdict.content.entry import Unevaluated
+
+_budget = None
+
+
+def sizeof(value):
+    """
+    Approximate number of bytes held by a value
+
+    >>> import numpy as np
+    >>> sizeof(np.zeros(1000))
+    8000
+    >>> sizeof(3) > 0
+    True
+    """
+    if hasattr(value, "memory_usage") and callable(value.memory_usage):  # pandas
+        try:
+            usage = value.memory_usage(deep=True)
+            return int(getattr(usage, "sum", lambda: usage)())
+        except TypeError:  # pragma: no cover
+            pass
+    if isinstance(nbytes := getattr(value, "nbytes", None), int):  # numpy, bytes-like buffers
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class MemoryBudget:
+    """
+    Keep the values of the tracked entries under `max_bytes`, evicting the least recently used ones
+
+    Evicted entries become unevaluated again, i.e., they are recomputed (or refetched, if cached) on the next access.
+    The most recently tracked entry is never evicted, even if it alone exceeds the budget.
+
+    >>> import numpy as np
+    >>> from hdict import hdict, apply
+    >>> d = hdict(n=1000) >> apply(lambda n: np.ones(n)).a >> apply(lambda n: np.zeros(n)).b
+    >>> budget = MemoryBudget(max_bytes=10000)
+    >>> d.a, d.b  # doctest:+ELLIPSIS
+    (array([1., ...]), array([0., ...]))
+    >>> budget.track(d.raw["a"])
+    >>> budget.track(d.raw["b"])
+    >>> d.raw["a"].isevaluated, d.raw["b"].isevaluated
+    (False, True)
+    >>> int(d.a.sum())
+    1000
+    >>> budget
+    MemoryBudget(max_bytes=10000, tracked=8000, entries=1, evictions=1)
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # id(entry) -> (weak reference to entry, size)
+        self.total = self.evictions = 0
+        self.lock = RLock()
+
+    def track(self, entry):
+        """Account for the (new) value of an evaluated entry, evicting others if needed"""
+        if entry.compacted or not entry.isevaluated:
+            return
+        size, key = sizeof(entry._value), id(entry)
+        victims = []
+        with self.lock:
+            self._forget(key)
+            self.entries[key] = ref(entry, lambda _, key=key: self._forget(key)), size
+            self.total += size
+            while self.total > self.max_bytes and len(self.entries) > 1:
+                _, (r, s) = self.entries.popitem(last=False)
+                self.total -= s
+                if (victim := r()) is not None and not victim.compacted:
+                    victims.append(victim)
+            self.evictions += len(victims)
+        for victim in victims:
+            victim._value = Unevaluated()
+
+    def touch(self, entry):
+        """Mark an entry as recently used"""
+        with self.lock:
+            if id(entry) in self.entries:
+                self.entries.move_to_end(id(entry))
+
+    def _forget(self, key):
+        with self.lock:
+            if (item := self.entries.pop(key, None)) is not None:
+                self.total -= item[1]
+
+    def __repr__(self):
+        return f"MemoryBudget(max_bytes={self.max_bytes}, tracked={self.total}, entries={len(self.entries)}, evictions={self.evictions})"
+
+
+def set_memory_budget(max_bytes):
+    """
+    Limit the memory held by all evaluated Closure, SubValue and Cached entries of the process
+
+    `None` disables the limit (default).
+
+    >>> import numpy as np
+    >>> from hdict import hdict, apply
+    >>> budget = set_memory_budget(20000)
+    >>> d = hdict(n=1000) >> apply(lambda n: np.ones(n)).a >> apply(lambda a: a * 2).b >> apply(lambda b: b * 2).c
+    >>> int(d.c.sum())
+    4000
+    >>> [d.raw[k].isevaluated for k in "abc"]
+    [False, True, True]
+    >>> int(d.a.sum())
+    1000
+    >>> [d.raw[k].isevaluated for k in "abc"]
+    [True, False, True]
+    >>> set_memory_budget(None)
+    """
+    global _budget
+    _budget = None if max_bytes is None else MemoryBudget(max_bytes)
+    return _budget
+
+
+def tracked(entry):
+    """Report an evaluated entry to the global budget, if any"""
+    if _budget is not None:
+        _budget.track(entry)
+
+
+def touched(entry):
+    """Report a read of an already evaluated entry to the global budget, if any"""
+    if _budget is not None:
+        _budget.touch(entry)
@@ -0,0 +1,249 @@
+from asyncio import gather, get_running_loop, ensure_future
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import get_context, cpu_count
+
+from hdict.evaluation.budget import MemoryBudget
+from hdict.evaluation.graph import upstream, dependents, Liveness
+from hdict.evaluation.registry import remember, isregistered, registry_enabled
+
+# Closures of the wave a worker process was forked for; set by `_init()` in each worker, never in the parent.
+_wave = []
+
+
+def evaluate(entries, executor=None, max_workers=None, free=False, max_bytes=None):
+    """
+    Evaluate `entries` and everything they depend on
+
+    Args:
+        entries:        iterable of AbsEntry objects
+        executor:       None (sequential), "threads" or "processes" (independent entries are evaluated concurrently)
+        max_workers:    maximum number of simultaneous workers; `None` means the default of `concurrent.futures`
+        free:           free each intermediate value as soon as its last consumer is evaluated; only `entries` are kept
+        max_bytes:      keep the values evaluated here under this size, evicting the least recently evaluated ones
+
+    >>> from threading import Barrier
+    >>> from hdict import hdict, apply
+    >>> barrier = Barrier(2, timeout=10)
+    >>> d = hdict(x=2) >> apply(lambda x: barrier.wait() * 0 + x + 1).a >> apply(lambda x: barrier.wait() * 0 + x * 3).b
+    >>> d >>= apply(lambda a, b: a + b).c
+    >>> evaluate(d.raw.values(), executor="threads", max_workers=2)  # Would deadlock if `a` and `b` were not simultaneous.
+    >>> d.show(colored=False)
+    {
+        x: 2,
+        a: 3,
+        b: 6,
+        c: 9,
+        _id: KCVG8F5bJ4eVZ-ZAsw7XsHnitkOKNydum0eR2DDK,
+        _ids: {
+            x: k3PWYRxIEc0lEvD1f6rbnk.36RAD5AyfROy1aT29,
+            a: VaaovLU.72O5x65aQZjrv-b4cooeUI.s3Qkpt-FF,
+            b: lGi0zeNZvy-1NP4nXUvFcq9.u8wb6CCKIz2dkKI0,
+            c: 0UADI3cK5VZhe6-CrodLq773sx7Hzf2cCSxXa48S
+        }
+    }
+    """
+    entries = list(entries)
+    nodes = upstream(entries)
+    done = finisher(nodes, entries, free, max_bytes)
+    match executor:
+        case None:
+            for node in nodes:
+                node.evaluate()
+                if done:
+                    done(node)
+        case "threads":
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                schedule(nodes, lambda node: pool.submit(node.evaluate), done)
+        case "processes":
+            schedule_waves(nodes, max_workers, done)
+        case _:  # pragma: no cover
+            raise Exception(f"Unknown executor: `{executor}`. Options: None, 'threads', 'processes'.")
+
+
+def finisher(nodes, keep, free=False, max_bytes=None):
+    """Callback to be called with each evaluated node, to free dead intermediate values and/or to enforce a memory budget"""
+    callbacks = []
+    if free:
+        callbacks.append(Liveness(nodes, keep).consumed)
+    if max_bytes is not None:
+        callbacks.append(MemoryBudget(max_bytes).track)
+    if not callbacks:
+        return None
+
+    def done(node):
+        for callback in callbacks:
+            callback(node)
+
+    return done
+
+
+def schedule(nodes, submit, done=None):
+    """
+    Submit each node as soon as all its dependencies are done
+
+    `submit` receives a node and returns a `concurrent.futures.Future`.
+    `done`, if given, is called with each node right after it is evaluated.
+    """
+    children, pending = dependents(nodes)
+    running = {}
+    for node in nodes:
+        if pending[id(node)] == 0:
+            running[submit(node)] = node
+    while running:
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in finished:
+            node = running.pop(future)
+            if (e := future.exception()) is not None:
+                for f in running:
+                    f.cancel()
+                raise e
+            if done:
+                done(node)
+            for child in children[id(node)]:
+                pending[id(child)] -= 1
+                if pending[id(child)] == 0:
+                    running[submit(child)] = child
+
+
+def schedule_waves(nodes, max_workers=None, done=None):
+    """
+    Evaluate closures in forked worker processes, one wave of ready closures at a time
+
+    Workers are forked right before each wave, so the applied functions and the already evaluated arguments
+    reach them by copy-on-write instead of being pickled for every task.
+    Only the results are sent back, to be stored in the parent process.
+    The remaining entries (SubValue, Wrapper, Cached) are cheap or touch the storage, so they are evaluated locally.
+
+    >>> import os
+    >>> from hdict import hdict, apply
+    >>> d = hdict(pid=os.getpid()) >> apply(lambda pid: os.getpid() != pid).a >> apply(lambda pid: [os.getpid() != pid, 2])("b", "c")
+    >>> d >>= apply(lambda a, b, c: a and b and c).r
+    >>> schedule_waves(upstream(d.raw.values()), max_workers=2)
+    >>> d.r
+    2
+
+    Each pool carries its own wave, so simultaneous evaluations do not mix their results.
+    >>> from threading import Thread
+    >>> ds = [hdict(x=x) >> apply(lambda x: x * 2).y for x in "ABCD"]
+    >>> threads = [Thread(target=lambda d=d: schedule_waves(upstream(d.raw.values()))) for d in ds]
+    >>> for t in threads:
+    ...     t.start()
+    >>> for t in threads:
+    ...     t.join()
+    >>> [d.y for d in ds]
+    ['AA', 'BB', 'CC', 'DD']
+    """
+    from hdict.content.entry.closure import Closure
+
+    try:
+        context = get_context("fork")
+    except ValueError as e:  # pragma: no cover
+        raise Exception(f"Process-pool evaluation needs the 'fork' start method, which is not available in this platform: {e}")
+    children, pending = dependents(nodes)
+    ready, wave = [node for node in nodes if pending[id(node)] == 0], []
+
+    def release(node):
+        if done:
+            done(node)
+        for child in children[id(node)]:
+            pending[id(child)] -= 1
+            if pending[id(child)] == 0:
+                ready.append(child)
+
+    while ready or wave:
+        while ready:
+            node = ready.pop()
+            if isinstance(node, Closure) and not (registry_enabled() and isregistered(node.id)):
+                wave.append(node)
+            else:
+                node.evaluate()
+                release(node)
+        if wave:
+            # The wave reaches the workers as an argument of the fork, so it is neither pickled nor shared between pools.
+            with ProcessPoolExecutor(min(max_workers or cpu_count(), len(wave)), mp_context=context, initializer=_init, initargs=(wave,)) as pool:
+                results = list(pool.map(_call, range(len(wave))))
+            for node, result in zip(wave, results):
+                node._value = result
+                if registry_enabled():
+                    remember(node.id, result)
+                release(node)
+            wave = []
+
+
+def _init(wave):
+    global _wave
+    _wave = wave
+
+
+def _call(idx):
+    return _wave[idx].value
+
+
+async def aevaluate(entries, max_workers=None, free=False, max_bytes=None):
+    """
+    Evaluate `entries` and everything they depend on, inside the running event loop
+
+    Each entry starts as soon as its own dependencies are done.
+    `free` and `max_bytes` have the same meaning as in `evaluate()`.
+    Async closures (`async def` functions) are awaited in the event loop, overlapping with each other.
+    The remaining entries are evaluated in a thread pool, not to block the event loop.
+
+    >>> import asyncio
+    >>> from hdict import hdict, apply
+    >>> async def ping(x):  # `ping` and `pong` wait for each other, so they must overlap.
+    ...     a_started.set()
+    ...     await asyncio.wait_for(b_started.wait(), 10)
+    ...     return x + 1
+    >>> async def pong(x):
+    ...     b_started.set()
+    ...     await asyncio.wait_for(a_started.wait(), 10)
+    ...     return x * 3
+    >>> async def main():
+    ...     d = hdict(x=2) >> apply(ping).a >> apply(pong).b >> apply(lambda a, b: a + b).c
+    ...     await aevaluate(d.raw.values())
+    ...     return d
+    >>> a_started, b_started = asyncio.Event(), asyncio.Event()
+    >>> asyncio.run(main()).show(colored=False)
+    {
+        x: 2,
+        a: 3,
+        b: 6,
+        c: 9,
+        _id: dBdNeoeWRp7oxBlbgC1OVMcbwwdQw3-nnCec86bb,
+        _ids: {
+            x: k3PWYRxIEc0lEvD1f6rbnk.36RAD5AyfROy1aT29,
+            a: hVG4mPN-CyKbXz.GMNqnwjcygYPk7GDNkyRe6SSe,
+            b: 7osrI47WGKZwe-TT4voy5N.utGBnIYSSrQN2eCNF,
+            c: XTwTBJGd1yfGndm-uUEsKvF6IRMttsWECtiDJPp4
+        }
+    }
+    """
+    from hdict.content.entry.closure import Closure
+
+    loop = get_running_loop()
+    entries = list(entries)
+    nodes = upstream(entries)
+    done = finisher(nodes, entries, free, max_bytes)
+    tasks = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        async def settle(node):
+            await gather(*(tasks[id(dep)] for dep in node.dependencies if id(dep) in tasks))
+            if isinstance(node, Closure) and not (registry_enabled() and isregistered(node.id)) and node.isasync:
+                node._value = result = await node.f()
+                if registry_enabled():
+                    remember(node.id, result)
+            else:
+                await loop.run_in_executor(pool, node.evaluate)
+            if done:
+                done(node)
+
+        # Topological order ensures the tasks of the dependencies already exist.
+        for node in nodes:
+            tasks[id(node)] = ensure_future(settle(node))
+        try:
+            await gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
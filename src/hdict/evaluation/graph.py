@@ -0,0 +1,93 @@
+from threading import Lock
+
+
+def upstream(entries):
+    """
+    Unevaluated entries needed to evaluate `entries`, dependencies first
+
+    The traversal uses an explicit stack, so long chains of closures do not consume Python stack frames.
+    Entries are identified by `id()`, since some of them are unhashable dataclasses.
+
+    >>> from hdict import hdict, apply
+    >>> d = hdict(x=2) >> apply(lambda x: x + 1).y >> apply(lambda y: y * 2).z >> apply(lambda x: -x).w
+    >>> [repr(e) for e in upstream([d.raw["z"]])]
+    ['λ(x)', 'λ(y)']
+    >>> d.y
+    3
+    >>> [repr(e) for e in upstream(d.raw.values())]
+    ['λ(y)', 'λ(x)']
+    """
+    order, visited = [], set()
+    for root in entries:
+        if root.isevaluated or id(root) in visited:
+            continue
+        visited.add(id(root))
+        stack = [(root, iter(root.dependencies))]
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                if not dep.isevaluated and id(dep) not in visited:
+                    visited.add(id(dep))
+                    stack.append((dep, iter(dep.dependencies)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    return order
+
+
+def dependents(nodes):
+    """
+    Map each node (by `id()`) to the nodes that depend on it, and count the pending dependencies of each node
+
+    Only dependencies inside `nodes` are considered; the others are expected to be already evaluated.
+    """
+    ids = {id(node) for node in nodes}
+    children, pending = {i: [] for i in ids}, {}
+    for node in nodes:
+        deps = {id(dep) for dep in node.dependencies} & ids
+        pending[id(node)] = len(deps)
+        for dep in deps:
+            children[dep].append(node)
+    return children, pending
+
+
+class Liveness:
+    """
+    Track the consumers of each node, to free its value right after the last one is evaluated
+
+    Nodes in `keep` (e.g., the requested fields) are never freed.
+    Freed entries become unevaluated again: they can be recomputed (or refetched, if cached) when needed.
+
+    >>> from hdict import hdict, apply
+    >>> d = hdict(x=2) >> apply(lambda x: x + 1).y >> apply(lambda y: y * 2).z
+    >>> nodes = upstream([d.raw["z"]])
+    >>> liveness = Liveness(nodes, keep=[d.raw["z"]])
+    >>> for node in nodes:
+    ...     node.evaluate()
+    ...     liveness.consumed(node)
+    >>> d.raw["y"].isevaluated, d.raw["z"].isevaluated
+    (False, True)
+    >>> d.z, d.y
+    (6, 3)
+    """
+
+    def __init__(self, nodes, keep):
+        ids = {id(node) for node in nodes}
+        self.inputs = {id(node): [dep for dep in node.dependencies if id(dep) in ids] for node in nodes}
+        self.remaining = {}
+        for deps in self.inputs.values():
+            for dep in deps:
+                self.remaining[id(dep)] = self.remaining.get(id(dep), 0) + 1
+        self.keep = {id(entry) for entry in keep}
+        self.lock = Lock()
+
+    def consumed(self, node):
+        """Register that `node` was evaluated, freeing the inputs that have no other pending consumer"""
+        from hdict.content.entry import Unevaluated
+
+        with self.lock:
+            for dep in self.inputs[id(node)]:
+                self.remaining[id(dep)] -= 1
+                if self.remaining[id(dep)] == 0 and id(dep) not in self.keep and not dep.compacted:
+                    dep._value = Unevaluated()
@@ -0,0 +1,86 @@
+from itertools import count
+
+from hdict.evaluation.graph import upstream
+
+
+class Plan:
+    """
+    Upstream dependency graph of the requested fields, split by what is needed to get each node's value
+
+    `evaluated`: values already available.
+    `cached`: values that are only fetched from (or written to) a storage, no function is called for them.
+    `tocompute`: values that depend on calling a function, in topological order.
+    Entries not reachable through a field of the hdict (e.g., replaced ones) are labeled by their type and a sequential number.
+
+    >>> from hdict import hdict, apply, cache
+    >>> storage = {}
+    >>> d = hdict(x=3) >> apply(lambda x: x + 1).y >> cache(storage)
+    >>> d.y
+    4
+    >>> d = hdict(x=3) >> apply(lambda x: x + 1).y >> cache(storage)
+    >>> d >>= apply(lambda y: y * 2).z >> apply(lambda x: -x).w >> apply(lambda z, w: z + w).v
+    >>> d.plan(["z"])
+    Plan(fields=['z'], evaluated=[], cached=['y'], tocompute=['z'])
+    >>> d.plan(["z"]).evaluate()
+    >>> d.z
+    8
+    >>> d.raw["w"].isevaluated
+    False
+    >>> d.plan()
+    Plan(fields=['x', 'y', 'z', 'w', 'v'], evaluated=['x', 'y', 'z'], cached=[], tocompute=['w', 'v'])
+    >>> d = hdict(x=0)
+    >>> for _ in range(5000):
+    ...     d >>= apply(lambda x: x + 1).x
+    >>> plan = d.plan(["x"])
+    >>> plan.evaluated, plan.tocompute[:2], plan.tocompute[-1]
+    (['<value 0>'], ['<Closure 1>', '<Closure 2>'], 'x')
+    """
+
+    def __init__(self, data: dict, fields=None):
+        from hdict.content.entry.cached import Cached
+
+        if fields is None:
+            fields = list(data)
+        elif missing := [field for field in fields if field not in data]:
+            raise Exception(f"Cannot plan the evaluation of missing fields: {missing}")
+        self.fields = list(fields)
+        self.data = data
+        self.nodes = upstream([data[field] for field in self.fields])
+        labels = {}
+        for key, entry in data.items():
+            labels[id(entry)] = key
+            # Fetching/storing layers share the field name with the wrapped entry.
+            if (inner := getattr(entry, "entry", None)) is not None:
+                labels.setdefault(id(inner), key)
+
+        unlabeled = count()
+
+        def label(entry):
+            if (key := labels.get(id(entry))) is None:
+                # A cheap label: the `repr` of an old version of a field would recurse through all its previous versions.
+                labels[id(entry)] = key = f"<{type(entry).__name__} {next(unlabeled)}>"
+            return key
+
+        evaluated, cached, tocompute = {}, {}, {}
+        for field in self.fields:
+            if data[field].isevaluated:
+                evaluated[field] = None
+        for node in self.nodes:
+            for dep in node.dependencies:
+                if dep.isevaluated:
+                    evaluated[label(dep)] = None
+        for node in self.nodes:
+            if isinstance(node, Cached) and all(dep.isevaluated for dep in node.dependencies):
+                cached[label(node)] = None
+            else:
+                tocompute[label(node)] = None
+        self.evaluated, self.cached, self.tocompute = list(evaluated), list(cached), list(tocompute)
+
+    def evaluate(self, executor=None, max_workers=None, free=False, max_bytes=None):
+        """Evaluate only the requested fields and what they depend on; see `frozenhdict.evaluate()`"""
+        from hdict.evaluation.executor import evaluate
+
+        evaluate([self.data[field] for field in self.fields], executor, max_workers, free, max_bytes)
+
+    def __repr__(self):
+        return f"Plan(fields={self.fields}, evaluated={self.evaluated}, cached={self.cached}, tocompute={self.tocompute})"
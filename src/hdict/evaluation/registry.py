@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from threading import Lock
+
+from hdict.content.entry import Unevaluated
+
+_registry = None
+
+
+class Registry:
+    """
+    Process-wide map from entry ids to evaluated values, bounded by the number of items (least recently used go first)
+
+    Values are held by strong references: most results (numbers, lists, tuples) cannot be weakly referenced.
+
+    >>> r = Registry(maxsize=2)
+    >>> r.put("a", 1)
+    >>> r.put("b", 2)
+    >>> r.get("a")
+    1
+    >>> r.put("c", 3)
+    >>> list(r.values), r.get("b")
+    (['a', 'c'], Unevaluated())
+    >>> r
+    Registry(items=2, maxsize=2, hits=1, misses=1)
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.values = OrderedDict()
+        self.hits = self.misses = 0
+        self.lock = Lock()
+
+    def get(self, id):
+        with self.lock:
+            if id in self.values:
+                self.values.move_to_end(id)
+                self.hits += 1
+                return self.values[id]
+            self.misses += 1
+        return Unevaluated()
+
+    def put(self, id, value):
+        with self.lock:
+            self.values[id] = value
+            self.values.move_to_end(id)
+            while len(self.values) > self.maxsize:
+                self.values.popitem(last=False)
+
+    def __contains__(self, id):
+        return id in self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"Registry(items={len(self)}, maxsize={self.maxsize}, hits={self.hits}, misses={self.misses})"
+
+
+def enable_registry(maxsize=1024):
+    """
+    Share evaluated values among all entries (of any hdict) with the same id, to avoid computing/fetching them again
+
+    The registry is disabled by default.
+
+    >>> from hdict import hdict, apply
+    >>> calls = []
+    >>> def prep(x):
+    ...     calls.append(x)
+    ...     return x * 2
+    >>> reg = enable_registry(maxsize=100)
+    >>> a = hdict(x=5) >> apply(prep).y >> apply(lambda y: y + 1).z
+    >>> b = hdict(x=5) >> apply(prep).y >> apply(lambda y: y - 1).z
+    >>> a.z, b.z, calls
+    (11, 9, [5])
+
+    Registered values are still written to the storage of a `cache()` step.
+    >>> from hdict import cache
+    >>> storage = {}
+    >>> d = hdict(x=5) >> apply(prep).y >> cache(storage)
+    >>> d.y, calls, len(storage)
+    (10, [5], 1)
+    >>> disable_registry()
+    >>> c = hdict(x=5) >> apply(prep).y
+    >>> c.y, calls
+    (10, [5, 5])
+    """
+    global _registry
+    _registry = Registry(maxsize)
+    return _registry
+
+
+def disable_registry():
+    global _registry
+    _registry = None
+
+
+def registry_enabled():
+    """Whether the registry is enabled; checked before requesting ids, which may be calculated only on demand"""
+    return _registry is not None
+
+
+def recall(id):
+    """Value registered for the given id, or `Unevaluated()`"""
+    return Unevaluated() if _registry is None else _registry.get(id)
+
+
+def remember(id, value):
+    if _registry is not None:
+        _registry.put(id, value)
+
+
+def isregistered(id):
+    return _registry is not None and id in _registry
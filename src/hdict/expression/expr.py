@@ -66,11 +66,34 @@ class Expr(AbsStep):
         new.steps = lst
         return new
 
-    def solve(self):
+    def solve(self, executor=None, max_workers=None):
+        """
+        Apply all steps
+
+        The resulting hdict is evaluated right away when an `executor` is given; see `frozenhdict.evaluate()`.
+
+        >>> from hdict import hdict, apply
+        >>> d = (hdict(x=3) * apply(lambda x: x + 1).y * apply(lambda x: x * 2).z).solve(executor="processes", max_workers=2)
+        >>> d.show(colored=False)
+        {
+            x: 3,
+            y: 4,
+            z: 6,
+            _id: zB4K9ZLtMU3DA9lL5VIbXMsYpHVUzZJVIpxKqP-t,
+            _ids: {
+                x: KGWjj0iyLAn1RG6RTGtsGE3omZraJM6xO.kvG5pr,
+                y: KeU-dCTjUgnSYGRNrrMMr4i.hg64Dkkfb3c14eh3,
+                z: yVxDxDr.VRUVy4q7JRPmlXrKonDwwEfALZe3jitf
+            }
+        }
+        """
         from hdict.expression.step.edict import EDict
 
         gen = (step.dct if isinstance(step, EDict) else step for step in self)
-        return reduce(rshift, gen)
+        result = reduce(rshift, gen)
+        if executor is not None:
+            result.evaluate(executor, max_workers)
+        return result
 
     @property
     def unfrozen(self):
@@ -20,14 +20,49 @@
 #  part of this work is illegal and it is unethical regarding the effort and
 #  time spent here.
 #
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pickle import loads
 
 from hdict.abs import AbsAny
 
 
 @dataclass
 class Stored(AbsAny):
+    """
+    Content of an entry inside a storage
+
+    `blob` are the bytes of `content` already pickled (protocol 5), e.g., when it was hashed.
+    They are pickled as they are, instead of `content`, when the storage serializes this object.
+
+    >>> from pickle import dumps
+    >>> s = loads(dumps(Stored([1, 2], blob=dumps([1, 2], protocol=5))))
+    >>> s, s.kind.__name__
+    (Stored(content=[1, 2]), 'list')
+    """
+
     content: object
+    blob: bytes = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         self.kind = type(self.content)
+
+    def __getstate__(self):
+        if self.blob is None:
+            return self.__dict__
+        return {"blob": self.blob, "kind": self.kind}
+
+    def __setstate__(self, state):
+        if "content" not in state:
+            state = {"content": loads(state["blob"]), "blob": None, "kind": state["kind"]}
+        self.__dict__.update(state)
+
+
+def stored(content, storage):
+    """
+    `Stored` object for a storage, reusing the bytes pickled while hashing `content`, if available
+
+    Plain `dict` storages keep objects in memory, so there is nothing to reuse there.
+    """
+    from hdict.content.aux_value import pickled
+
+    return Stored(content, blob=None if isinstance(storage, dict) else pickled(content))